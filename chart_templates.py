@@ -0,0 +1,471 @@
+import json
+from typing import Callable
+
+import altair as alt
+import polars as pl
+
+from plot_theme import (
+    create_dg_custom_title,
+    dg_custom_axis,
+    dg_custom_legend,
+    dg_custom_tooltip,
+    score_color_scale,
+)
+
+# Chart template registry
+# Each chart is built once per process against named (empty) datasets, then
+# validated and serialized to a Vega-Lite spec that is cached. Rendering a chart
+# for new data only selects the columns the chart uses and splices them into the
+# cached spec as JSON, so no Altair objects are built, validated or serialized
+# on each reactive run.
+#
+#   chart_templates.render("score_range", rounds=filtered_df)
+
+THEME = "urbaninstitute"
+# Must match the major version of the cached specs' $schema (e.g. v6 for Altair 6)
+VEGALITE_MIME = f"application/vnd.vegalite.{alt.SCHEMA_VERSION.split('.')[0]}+json"
+
+OUTCOME_COLORS = alt.Scale(
+    domain=["Over Par", "Par", "Under Par"],
+    range=["orangered", "silver", "green"]
+)
+
+
+def axis(**kwargs) -> alt.Axis:
+    # dg_custom_axis with chart specific overrides
+    custom = dg_custom_axis.copy()
+    for key, value in kwargs.items():
+        custom[key] = value
+    return custom
+
+
+# Resuable chart components
+date_axis = alt.X(
+    "Date:T",
+    title="Date",
+    axis=axis(format="%b %d, %Y", labelAngle=-45)
+)
+
+# One row of panels per layout for hole-level charts
+layout_row = alt.Row("LayoutName:N", title="Layout")
+
+
+class ChartTemplate:
+    def __init__(self, name: str, build: Callable[[], alt.TopLevelMixin], data: dict[str, list[str]]):
+        self.name = name
+        self.build = build
+        # dataset name -> columns the chart reads from it
+        self.data = data
+        self._spec_json: str | None = None
+
+    @property
+    def spec_json(self) -> str:
+        # Validate & serialize the chart skeleton the first time it's needed
+        if self._spec_json is None:
+            with alt.theme.enable(THEME):
+                spec = self.build().to_dict(validate=True)
+            spec.pop("datasets", None)
+            self._spec_json = json.dumps(spec)
+        return self._spec_json
+
+    def render(self, **datasets: pl.DataFrame) -> "RenderedChart":
+        missing = set(self.data) - set(datasets)
+        if missing:
+            raise ValueError(f"Chart '{self.name}' needs data for: {', '.join(sorted(missing))}")
+        return RenderedChart(self.spec_json, {
+            name: datasets[name].select(columns).with_columns(
+                # Same date format Altair uses, so Vega parses them as local time
+                pl.col(pl.Date, pl.Datetime).cast(pl.Datetime).dt.strftime("%Y-%m-%dT%H:%M:%S")
+            ).write_json()
+            for name, columns in self.data.items()
+        })
+
+
+class RenderedChart:
+    # A cached spec plus this run's data, displayed by marimo as a Vega-Lite chart
+    def __init__(self, spec_json: str, datasets_json: dict[str, str]):
+        self.spec_json = spec_json
+        self.datasets_json = datasets_json
+
+    def to_json(self) -> str:
+        datasets = ",".join(f"{json.dumps(name)}:{rows}" for name, rows in self.datasets_json.items())
+        return f'{self.spec_json[:-1]},"datasets":{{{datasets}}}}}'
+
+    def to_dict(self) -> dict:
+        return json.loads(self.to_json())
+
+    def _mime_(self) -> tuple[str, str]:
+        return VEGALITE_MIME, self.to_json()
+
+
+TEMPLATES: dict[str, ChartTemplate] = {}
+
+
+def template(name: str, **data: list[str]):
+    # Register a chart builder under `name`, reading the given columns from each named dataset
+    def register(build: Callable[[], alt.TopLevelMixin]) -> Callable[[], alt.TopLevelMixin]:
+        TEMPLATES[name] = ChartTemplate(name, build, data)
+        return build
+    return register
+
+
+def render(name: str, **datasets: pl.DataFrame) -> RenderedChart:
+    return TEMPLATES[name].render(**datasets)
+
+
+def warm_up() -> None:
+    # Compile every template up front, e.g. before the first session needs them
+    for chart in TEMPLATES.values():
+        chart.spec_json
+
+
+# Score & attendance charts
+
+@template("score_range", rounds=["PlayerName", "Score"])
+def score_range():
+    # Score distribution plots
+    ## Bar with point layered on top
+    rounds = alt.Data(name="rounds")
+    player_axis = alt.Y(
+        "PlayerName:N",
+        sort=alt.EncodingSortField(field="Score", op="mean", order="ascending"),
+        title="Player Name",
+        axis=dg_custom_axis
+    )
+    score_tooltip = [
+        alt.Tooltip("PlayerName:N", title="Player"),
+        alt.Tooltip("min(Score):Q", title="Best Score"),
+        alt.Tooltip("max(Score):Q", title="Worst Score"),
+        alt.Tooltip("mean(Score):Q", title="Avg Score", format=".2f"),
+        alt.Tooltip("stdev(Score):Q", title="Std Dev", format=".2f")
+    ]
+
+    mean_points = alt.Chart(rounds).mark_point(filled=True, size=100).encode(
+        y=player_axis,
+        x=alt.X("mean(Score):Q", title="Average Score (Relative to Par)", axis=dg_custom_axis),
+        color=alt.Color("mean(Score):Q", scale=score_color_scale, title="Avg Score", legend=dg_custom_legend),
+        tooltip=score_tooltip,
+    )
+
+    bar = alt.Chart(rounds).mark_bar(cornerRadius=8, height=7).encode(
+        x=alt.X("min(Score):Q", scale=alt.Scale(domain=[-18, 40]), title="Best Score", axis=dg_custom_axis),
+        x2=alt.X2("max(Score):Q", title="Worst Score"),
+        y=player_axis,
+        tooltip=score_tooltip,
+    )
+
+    text_min = alt.Chart(rounds).mark_text(align="right", color="black", dx=-5).encode(
+        x="min(Score):Q",
+        y=player_axis,
+        text="min(Score):Q"
+    )
+
+    text_max = alt.Chart(rounds).mark_text(align="left", color="black", dx=5).encode(
+        x="max(Score):Q",
+        y=player_axis,
+        text="max(Score):Q"
+    )
+
+    return (bar + text_min + text_max + mean_points).properties(
+        title=create_dg_custom_title("Lowest, Avg, & Highest Round Score by Player", "Scores relative to Par"),
+        width=800,
+        height=400
+    )
+
+
+@template(
+    "attendance",
+    players=["PlayerName", "Rounds Played"],
+    league_avg=["Avg Attendance", "Label"],
+)
+def attendance():
+    # Attendance bar chart with a rule at the league's average attendance
+    rule = alt.Chart(alt.Data(name="league_avg")).mark_rule(color="black", size=3).encode(
+        x="Avg Attendance:Q"
+    )
+    label = rule.mark_text(x="width", dx=4, align="left", baseline="bottom", color="black").encode(
+        text="Label:N"
+    )
+
+    bars = alt.Chart(alt.Data(name="players")).mark_bar().encode(
+        y=alt.Y("PlayerName:N", sort="-x", title="Player Name", axis=dg_custom_axis),
+        x=alt.X("Rounds Played:Q", scale=alt.Scale(round=True), title="Number of Rounds", axis=axis(format="d")),
+        color=alt.Color("Rounds Played:Q", legend=dg_custom_legend),
+        tooltip=[alt.Tooltip("PlayerName:N", title="Player"), "Rounds Played:Q"],
+    )
+
+    return (bars + rule + label).properties(
+        title=create_dg_custom_title("League Attendance"),
+        width=800,
+        height=500
+    )
+
+
+def outcome_rates(y: alt.Y, title: str) -> alt.LayerChart:
+    # Normalized Under Par | Par | Over Par bars, with counts
+    holes = alt.Data(name="holes")
+    bar = alt.Chart(holes).mark_bar().encode(
+        x=alt.X("count(Hole Outcome):Q", stack="normalize", title="Outcome of Holes Played", axis=dg_custom_axis),
+        y=y,
+        color=alt.Color("Hole Outcome:N", scale=OUTCOME_COLORS, legend=dg_custom_legend)
+    )
+    text = alt.Chart(holes).mark_text(dx=-15, dy=3, color="white").encode(
+        x=alt.X("count(Hole Outcome):Q", stack="normalize"),
+        y=y,
+        detail="Hole Outcome:N",
+        text=alt.Text("count(Hole Outcome):Q")
+    )
+    return (bar + text).properties(
+        title=create_dg_custom_title(title, "Under Par counts eagles, aces, birdies; Over Par counts anything bogey+"),
+        width=800,
+        height=400
+    )
+
+
+@template("player_hole_outcomes", holes=["PlayerName", "Hole Outcome"])
+def player_hole_outcomes():
+    return outcome_rates(alt.Y("PlayerName:N", title="Player Name", axis=dg_custom_axis), "Player Bird | Par | Bogey Rate")
+
+
+# Performance over time charts
+
+@template(
+    "performance_over_time",
+    daily_avg=["Date", "Daily Avg Score", "Total Rounds"],
+    rounds=["Date", "PlayerName", "Score", "cum_avg", "CourseName", "LayoutName"],
+)
+def performance_over_time():
+    daily_avg = alt.Data(name="daily_avg")
+    score_axis = alt.Y("Daily Avg Score:Q", title="Score (Relative to Par)", axis=dg_custom_axis)
+
+    # Base chart for daily averages
+    daily_avg_bars = alt.Chart(daily_avg).mark_bar(opacity=0.7, color="blue", width=25).encode(
+        x=date_axis,
+        y=score_axis,
+        tooltip=[
+            alt.Tooltip("Date:T", title="Date", format="%b %d, %Y"),
+            alt.Tooltip("Daily Avg Score:Q", format=".2f", title="Daily Average Score"),
+            "Total Rounds:Q",
+        ],
+    )
+
+    daily_avg_trend = alt.Chart(daily_avg).mark_line(opacity=0.5, color="blue").encode(
+        x=date_axis,
+        y=score_axis,
+    )
+
+    # Player scores as circles
+    player_scores = alt.Chart(alt.Data(name="rounds")).mark_circle(filled=True, opacity=0.4).encode(
+        x=date_axis,
+        y=alt.Y("Score:Q", title="Score (Relative to Par)"),
+        xOffset="jitter:Q",
+        color=alt.Color("PlayerName:N", legend=dg_custom_legend),
+        tooltip=[
+            *dg_custom_tooltip,
+            alt.Tooltip("cum_avg:Q", format=".2f", title="Player's Cumulative Average"),
+        ],
+    ).transform_calculate(
+        # Generate uniform jitter
+        jitter="random()"
+    )
+
+    return (daily_avg_bars + daily_avg_trend + player_scores).resolve_scale(y="shared").properties(
+        title=create_dg_custom_title(
+            "Player Performance Over Time",
+            "Blue bars show avg score of all rounds that day (to account for weather conditions), circles show individual scores, line shows trend over time",
+        ),
+        width=800,
+        height=500,
+    )
+
+
+@template(
+    "relative_performance",
+    rounds=["Date", "PlayerName", "Relative Score to Player Avg", "Score", "Avg Score", "Std Dev"],
+)
+def relative_performance():
+    # Relative performance chart
+    yrule = alt.Chart().mark_rule(strokeDash=[12, 6], size=2).encode(y=alt.datum(0))
+    label = yrule.mark_text(x="width", dx=-2, align="right", baseline="bottom", text="Player's Avg.")
+
+    performance = alt.Chart(alt.Data(name="rounds")).mark_line(point=True, strokeWidth=2).encode(
+        x=date_axis,
+        y=alt.Y(
+            "Relative Score to Player Avg:Q",
+            title="Performance (Relative to Player Average)",
+            axis=dg_custom_axis
+        ),
+        color=alt.Color("PlayerName:N", legend=dg_custom_legend),
+        tooltip=[
+            alt.Tooltip("PlayerName:N", title="Player"),
+            alt.Tooltip("Date:T", title="Date", format="%b %d, %Y"),
+            "Relative Score to Player Avg:Q",
+            "Score:Q",
+            "Avg Score:Q",
+            "Std Dev:Q",
+        ],
+    )
+
+    return (performance + yrule + label).properties(
+        title=create_dg_custom_title(
+            "Performance Relative to Player Average",
+            "Each Player's Avg Score is 0. The y-axis shows round scores as difference from each player's average.",
+        ),
+        width=800,
+        height=500,
+    )
+
+
+# Hole-by-hole charts
+
+@template("hole_outcomes", holes=["Hole#", "Hole Outcome"])
+def hole_outcomes():
+    return outcome_rates(alt.Y("Hole#:N", title="Hole Number", axis=dg_custom_axis), "Hole Bird | Par | Bogey Rate")
+
+
+@template(
+    "hole_difficulty",
+    holes=["LayoutName", "Hole#", "Avg_Score_vs_Par", "Best_Score_vs_Par", "Worst_Score_vs_Par", "CI_Low", "CI_High", "Total_Players"],
+)
+def hole_difficulty():
+    hole_axis = alt.Y("Hole#:N", title="Hole Number", sort=alt.SortField("Avg_Score_vs_Par"), axis=dg_custom_axis)
+
+    mean_points = alt.Chart().mark_point(filled=True, size=80).encode(
+        y=hole_axis,
+        x=alt.X("Avg_Score_vs_Par:Q", title="Score vs Par"),
+        color=alt.Color(
+            "Avg_Score_vs_Par:Q",
+            scale=alt.Scale(scheme="redyellowgreen", domain=[-2, 2], reverse=True),
+            title="Score vs Par",
+            legend=dg_custom_legend
+        ),
+        tooltip=[
+            "LayoutName:N",
+            "Hole#:N",
+            alt.Tooltip("Avg_Score_vs_Par:Q", title="Avg Score vs Par", format=".2f"),
+            alt.Tooltip("Best_Score_vs_Par:Q", title="Best Score vs Par"),
+            alt.Tooltip("Worst_Score_vs_Par:Q", title="Worst Score vs Par"),
+            alt.Tooltip("CI_Low:Q", title="95% CI Low"),
+            alt.Tooltip("CI_High:Q", title="95% CI High"),
+            "Total_Players:Q"
+        ]
+    )
+
+    error_bars = alt.Chart().mark_errorbar(color="blue", opacity=0.8, ticks=True).encode(
+        x=alt.X("CI_Low:Q", scale=alt.Scale(zero=False), title="Score vs Par", axis=dg_custom_axis),
+        x2="CI_High:Q",
+        y=hole_axis,
+    )
+
+    # One panel per layout, so the same hole number on different layouts isn't overlaid
+    return alt.layer(error_bars, mean_points, data=alt.Data(name="holes")).properties(
+        width=800,
+        height=500
+    ).facet(
+        row=layout_row
+    ).resolve_scale(
+        y="independent"
+    ).properties(
+        title=create_dg_custom_title(
+            "Hole Difficulty",
+            "Scores relative to Par; bars show the 95% confidence interval of the average"
+        )
+    )
+
+
+@template(
+    "player_hole_heatmap",
+    cells=["PlayerName", "LayoutName", "Hole#", "Avg_Score_vs_Par", "CI_Low", "CI_High", "Hole_Avg_vs_Par", "Rounds_Played"],
+)
+def player_hole_heatmap():
+    return alt.Chart(alt.Data(name="cells")).mark_rect().encode(
+        x=alt.X("Hole#:N", title="Hole Number", axis=dg_custom_axis),
+        y=alt.Y("PlayerName:N", title="PlayerName", axis=dg_custom_axis),
+        row=layout_row,
+        # Grey out cells without enough rounds for a confidence interval
+        color=alt.when(alt.datum.CI_Low == None)
+            .then(alt.value("lightgray"))
+            .otherwise(
+                alt.Color(
+                    "Avg_Score_vs_Par:Q",
+                    scale=alt.Scale(scheme="redyellowgreen", domain=[-2, 3], reverse=True),
+                    title="Avg Score vs Par",
+                    legend=dg_custom_legend
+                )
+            ),
+        tooltip=[
+            "PlayerName:N",
+            "LayoutName:N",
+            "Hole#:N",
+            alt.Tooltip("Avg_Score_vs_Par:Q", title="Player's Avg Score vs Par"),
+            alt.Tooltip("CI_Low:Q", title="95% CI Low"),
+            alt.Tooltip("CI_High:Q", title="95% CI High"),
+            alt.Tooltip("Hole_Avg_vs_Par:Q", title="Hole's Avg Score vs. Par (all players)"),
+            alt.Tooltip("Rounds_Played:Q", title="Rounds Played")
+        ]
+    ).properties(
+        title=create_dg_custom_title(
+            "Player Performance by Hole (Heatmap)",
+            "Grey cells have too few rounds for a confidence interval"
+        ),
+        width=800,
+        height=500
+    )
+
+
+# Strokes gained charts
+
+@template(
+    "strokes_gained_heatmap",
+    cells=["PlayerName", "LayoutName", "Hole#", "Avg_Strokes_Gained", "Total_Strokes_Gained", "Rounds_Played"],
+)
+def strokes_gained_heatmap():
+    return alt.Chart(alt.Data(name="cells")).mark_rect().encode(
+        x=alt.X("Hole#:N", title="Hole Number", axis=dg_custom_axis),
+        y=alt.Y("PlayerName:N", title="PlayerName", axis=dg_custom_axis),
+        row=layout_row,
+        color=alt.Color(
+            "Avg_Strokes_Gained:Q",
+            scale=alt.Scale(scheme="redyellowgreen", domainMid=0),
+            title="Avg Strokes Gained",
+            legend=dg_custom_legend
+        ),
+        tooltip=[
+            "PlayerName:N",
+            "LayoutName:N",
+            "Hole#:N",
+            alt.Tooltip("Avg_Strokes_Gained:Q", title="Avg Strokes Gained per Round"),
+            alt.Tooltip("Total_Strokes_Gained:Q", title="Total Strokes Gained"),
+            alt.Tooltip("Rounds_Played:Q", title="Rounds Played")
+        ]
+    ).properties(
+        title=create_dg_custom_title(
+            "Strokes Gained by Hole",
+            "Green = fewer throws than the rest of the field on that hole, that night"
+        ),
+        width=800,
+        height=500
+    )
+
+
+@template(
+    "strokes_gained_rounds",
+    rounds=["PlayerName", "Date", "LayoutName", "Strokes_Gained", "Holes_Compared"],
+)
+def strokes_gained_rounds():
+    return alt.Chart(alt.Data(name="rounds")).mark_line(point=True, strokeWidth=2).encode(
+        x=date_axis,
+        y=alt.Y("Strokes_Gained:Q", title="Strokes Gained (Round Total)", axis=dg_custom_axis),
+        color=alt.Color("PlayerName:N", legend=dg_custom_legend),
+        tooltip=[
+            alt.Tooltip("PlayerName:N", title="Player"),
+            alt.Tooltip("Date:T", title="Date", format="%b %d, %Y"),
+            "LayoutName:N",
+            "Strokes_Gained:Q",
+            "Holes_Compared:Q"
+        ]
+    ).properties(
+        title=create_dg_custom_title("Strokes Gained per Round", "Round total of strokes gained vs the rest of the field"),
+        width=800,
+        height=500
+    )
@@ -0,0 +1,214 @@
+from statistics import NormalDist
+
+import numpy as np
+import polars as pl
+
+import league_store
+
+# Confidence intervals & significance tests
+# Bootstraps are vectorized. Scores take only a handful of distinct values, so a
+# resample of a group is just how many times it drew each value: one multinomial
+# draw per group from the group's value frequencies, broadcast over every group
+# & resample as a (resamples x groups x values) array. Groups of mostly distinct
+# values (more groups x values than rows) fall back to a (resamples x rows) index
+# matrix into the group-sorted values, reduced per group with np.add.reduceat.
+# A fixed seed keeps the numbers stable between reactive re-runs.
+# Pairwise tests control the family-wise error rate with Holm's step-down
+# adjustment over all the pairs in a table.
+
+SEED = 42
+# CI methods selectable in the notebook (bootstrap by default, the normal approximation as a check)
+CI_METHODS = ["bootstrap", "analytic"]
+N_RESAMPLES = 2000
+# Cap on the number of resampled values held in memory per chunk
+MAX_DRAWS = 5_000_000
+
+
+def _grouped_values(df: pl.DataFrame, by: list[str], value_col: str) -> tuple[pl.DataFrame, np.ndarray, np.ndarray]:
+    # Sort so that each group's values are contiguous
+    grouped = df.select(*by, value_col).drop_nulls(value_col).sort(by)
+    sizes = grouped.group_by(by, maintain_order=True).len()
+    return (
+        sizes.select(by),
+        sizes["len"].to_numpy().astype(np.int64),
+        grouped[value_col].to_numpy().astype(np.float64),
+    )
+
+
+def _group_means(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    if len(values) == 0:
+        return np.empty(0)
+    return np.add.reduceat(values, np.concatenate([[0], np.cumsum(counts)[:-1]])) / counts
+
+
+def bootstrap_means(values: np.ndarray, counts: np.ndarray, n_resamples: int = N_RESAMPLES, seed: int = SEED) -> np.ndarray:
+    # Bootstrap distribution of each group's mean -> shape (n_resamples, n_groups)
+    # `values` holds the groups back to back, `counts` their sizes.
+    rng = np.random.default_rng(seed)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    means = np.empty((n_resamples, len(counts)))
+    if len(values) == 0:
+        return means
+
+    support, value_idx = np.unique(values, return_inverse=True)
+    if len(counts) * len(support) <= len(values):
+        # Frequency of each distinct value within each group
+        tally = np.zeros((len(counts), len(support)))
+        np.add.at(tally, (np.repeat(np.arange(len(counts)), counts), value_idx), 1)
+        pvals = tally / counts[:, None]
+        chunk = max(1, MAX_DRAWS // tally.size)
+        for lo in range(0, n_resamples, chunk):
+            hi = min(lo + chunk, n_resamples)
+            draws = rng.multinomial(counts, pvals, size=(hi - lo, len(counts)))
+            means[lo:hi] = draws @ support / counts
+        return means
+
+    # Every slot draws uniformly from within its own group
+    slot_start = np.repeat(starts, counts)
+    slot_n = np.repeat(counts, counts)
+    chunk = max(1, MAX_DRAWS // len(values))
+    for lo in range(0, n_resamples, chunk):
+        hi = min(lo + chunk, n_resamples)
+        idx = slot_start + (rng.random((hi - lo, len(values))) * slot_n).astype(np.int64)
+        means[lo:hi] = np.add.reduceat(values[idx], starts, axis=1) / counts
+    return means
+
+
+def bootstrap_ci(
+    df: pl.DataFrame,
+    by: str | list[str],
+    value_col: str = "Score_vs_Par",
+    ci: float = 0.95,
+    n_resamples: int = N_RESAMPLES,
+    seed: int = SEED,
+    min_n: int = 2,
+) -> pl.DataFrame:
+    # Percentile bootstrap CI of the mean of `value_col` for each group.
+    # Groups with fewer than `min_n` values get a null interval.
+    by = [by] if isinstance(by, str) else list(by)
+    keys, counts, values = _grouped_values(df, by, value_col)
+    boot = bootstrap_means(values, counts, n_resamples, seed)
+    alpha = (1 - ci) / 2
+    low, high = np.quantile(boot, [alpha, 1 - alpha], axis=0)
+
+    return keys.with_columns(
+        pl.Series("N", counts),
+        pl.Series("Mean", _group_means(values, counts)),
+        pl.Series("CI_Low", low),
+        pl.Series("CI_High", high),
+    ).with_columns(
+        pl.when(pl.col("N") >= min_n).then(pl.col(c)).alias(c) for c in ["CI_Low", "CI_High"]
+    )
+
+
+def analytic_ci(
+    df: pl.DataFrame,
+    by: str | list[str],
+    value_col: str = "Score_vs_Par",
+    ci: float = 0.95,
+    min_n: int = 2,
+) -> pl.DataFrame:
+    # Normal-approximation CI of the mean (mean +/- z * sd / sqrt(n)), same columns as bootstrap_ci
+    by = [by] if isinstance(by, str) else list(by)
+    z = NormalDist().inv_cdf(1 - (1 - ci) / 2)
+    half_width = z * pl.col(value_col).std() / pl.col(value_col).count().sqrt()
+    return (
+        df.group_by(by)
+        .agg(
+            pl.col(value_col).count().alias("N"),
+            pl.col(value_col).mean().alias("Mean"),
+            (pl.col(value_col).mean() - half_width).alias("CI_Low"),
+            (pl.col(value_col).mean() + half_width).alias("CI_High"),
+        )
+        .with_columns(
+            pl.when(pl.col("N") >= min_n).then(pl.col(c)).alias(c) for c in ["CI_Low", "CI_High"]
+        )
+        .sort(by)
+    )
+
+
+def holm(p_values: np.ndarray) -> np.ndarray:
+    # Holm-adjusted p-values: the i-th smallest of m is scaled by (m - i), made monotone & capped at 1
+    order = np.argsort(p_values, kind="stable")
+    scaled = np.maximum.accumulate(p_values[order] * (len(p_values) - np.arange(len(p_values))))
+    adjusted = np.empty(len(p_values))
+    adjusted[order] = np.minimum(scaled, 1.0)
+    return adjusted
+
+
+def adjust_pairs(pairs: pl.DataFrame, ci: float = 0.95) -> pl.DataFrame:
+    # (Re)compute P_Adjusted over exactly the pairs in `pairs`; Significant = P_Adjusted < 1 - ci
+    return pairs.with_columns(
+        pl.Series("P_Adjusted", holm(pairs["P_Value"].to_numpy()), dtype=pl.Float64)
+    ).with_columns(
+        (pl.col("P_Adjusted") < 1 - ci).alias("Significant")
+    ).sort("P_Value")
+
+
+def select_pairs(pairs: pl.DataFrame, names: list[str], by: str = "PlayerName", ci: float = 0.95) -> pl.DataFrame:
+    # Pairs between the given groups only, adjusted for that smaller family of tests
+    return adjust_pairs(
+        pairs.filter(pl.col(f"{by}_A").is_in(names), pl.col(f"{by}_B").is_in(names)), ci
+    )
+
+
+def pairwise_compare(
+    df: pl.DataFrame,
+    by: str = "PlayerName",
+    value_col: str = "Score",
+    ci: float = 0.95,
+    n_resamples: int = N_RESAMPLES,
+    seed: int = SEED,
+    min_n: int = 2,
+) -> pl.DataFrame:
+    # Bootstrap test of the difference in mean `value_col` for every pair of groups.
+    # Mean_Diff < 0 means the first player scores lower (better) than the second.
+    # CI_Low/CI_High are per pair; Significant uses the Holm-adjusted p-value.
+    keys, counts, values = _grouped_values(df, [by], value_col)
+    boot = bootstrap_means(values, counts, n_resamples, seed)
+    names = keys[by].to_list()
+    mean = _group_means(values, counts)
+    alpha = (1 - ci) / 2
+
+    rows = []
+    eligible = np.flatnonzero(counts >= min_n)
+    for pos, i in enumerate(eligible[:-1]):
+        others = eligible[pos + 1:]
+        # All of player i's pairings in one (resamples x others) block
+        diffs = boot[:, [i]] - boot[:, others]
+        low, high = np.quantile(diffs, [alpha, 1 - alpha], axis=0)
+        # Two-sided bootstrap p-value
+        p = np.minimum(1.0, 2 * np.minimum((diffs <= 0).mean(axis=0), (diffs >= 0).mean(axis=0)))
+        for j, lo, hi, pv in zip(others, low, high, p):
+            rows.append((names[i], names[j], mean[i] - mean[j], lo, hi, pv))
+
+    return pl.DataFrame(
+        rows,
+        schema={
+            f"{by}_A": pl.String, f"{by}_B": pl.String,
+            "Mean_Diff": pl.Float64, "CI_Low": pl.Float64, "CI_High": pl.Float64, "P_Value": pl.Float64,
+        },
+        orient="row",
+    ).pipe(adjust_pairs, ci)
+
+
+def league_hole_cis(league: league_store.LeagueData, method: str = "bootstrap") -> dict[str, pl.DataFrame]:
+    # 95% CIs of the average score vs par per hole and per player & hole (of each layout),
+    # computed once per league & method
+    ci = {"analytic": analytic_ci, "bootstrap": bootstrap_ci}[method]
+
+    def build(league: league_store.LeagueData) -> dict[str, pl.DataFrame]:
+        return {
+            "by_hole": ci(league.hole_analysis, ["CourseName", "LayoutName", "Hole#"]),
+            "by_player_hole": ci(league.hole_analysis, ["PlayerName", "CourseName", "LayoutName", "Hole#"]),
+        }
+
+    return league_store.derived(league, f"hole_cis_{method}", build)
+
+
+def league_pairwise(league: league_store.LeagueData) -> pl.DataFrame:
+    # Head-to-head round score tests between every pair of players over all of the league's
+    # rounds, computed once per league; narrow it to a selection of players with select_pairs
+    return league_store.derived(
+        league, "pairwise", lambda league: pairwise_compare(league.df_long, "PlayerName", "Score")
+    )
@@ -4,12 +4,9 @@ __generated_with = "0.18.4"
 app = marimo.App(width="full")
 
 with app.setup:
+    # Only marimo is imported up front so the upload widget shows straight away,
+    # the data & charting libraries are imported by the `imports` cell below
     import marimo as mo
-    import polars as pl
-    import polars.selectors as cs
-    import altair as alt
-    import numpy as np
-    from datetime import datetime
 
 
 @app.cell(hide_code=True)
@@ -37,73 +34,90 @@ def upload_data_files():
 
 
 @app.cell(hide_code=True)
-def read_preproc_data(csv_file):
-    mo.stop(len(csv_file.value) == 0, mo.md("... upload data to analyze"))
+def imports():
+    # Heavy imports run after the upload widget is on screen, while the user picks their files.
+    # (Already imported modules are shared by every session in the server process, see serve.py)
+    import polars as pl
+    import polars.selectors as cs
+    import league_store
+    import hole_stats
+    import confidence
+    import strokes_gained
+    import chart_templates
+    import validation
+    import season_sim
+    return (
+        chart_templates,
+        confidence,
+        cs,
+        hole_stats,
+        league_store,
+        pl,
+        season_sim,
+        strokes_gained,
+        validation,
+    )
+
+
+@app.cell(hide_code=True)
+def read_preproc_data(csv_file, league_store):
+    # Without an upload, reopen a league only if this session asks for it by key (?league=<key> in the URL)
+    _key = mo.query_params().get("league")
+    league = league_store.find_league(_key) if len(csv_file.value) == 0 and _key else None
+    mo.stop(len(csv_file.value) == 0 and league is None, mo.md("... upload data to analyze"))
 
     # Process uploaded data
-    # Transform the data into long format for time series analysis
-    static_cols = ["PlayerName", "CourseName", "LayoutName", "StartDate", "EndDate"]
-    drop_cols = []
-    start_end_date_cols = ["StartDate", "EndDate"]
-
+    # Cleaned league data is loaded once per server process and shared (read-only)
+    # between every session that uploads the same files; see league_store.py
     if csv_file.value is not None and len(csv_file.value) > 0:
-        # Read each CSV file and concatenate them
-        dfs = []
-        for file_info in csv_file.value:
-            df = pl.read_csv(file_info.contents, try_parse_dates=True)
-            dfs.append(df)
-
-        # Concatenate all dataframes vertically
-        df_clean = pl.concat(dfs)
-    else:
+        league = league_store.load_league(file_info.contents for file_info in csv_file.value)
+    elif league is None:
         mo.stop("File upload format not recognized. Please check your .csv file.")
+    df_clean = league.df_clean
 
 
-    mo.accordion({
-        "Check Data Uploaded":
-        mo.ui.dataframe(df_clean)
-    })
-    return (df_clean,)
+    mo.vstack([
+        mo.md(f"Add `?league={league.key}` to this page's address to come back to this data without uploading it again."),
+        mo.accordion({
+            "Check Data Uploaded":
+            mo.ui.dataframe(df_clean)
+        })
+    ])
+    return df_clean, league
 
 
 @app.cell
-def clean_data(csv_file, df_clean):
-    mo.stop(len(csv_file.value) == 0)
-
+def clean_data(df_clean, league, validation):
     # check data is comparable Course and layout
     if df_clean["CourseName"].n_unique() > 1 or df_clean["LayoutName"].n_unique() > 1:
         print("Course or Layout differ in the data set! Results may not be fair comparison.")
 
-    # clean the date times
-    def clean_date_duration(df: pl.DataFrame | pl.LazyFrame, start_col: str = "StartDate", end_col: str ="EndDate") -> pl.DataFrame | pl.LazyFrame:
-        return df.with_columns(
-            pl.col(start_col).cast(pl.Date).alias("Date"),
-            (pl.col(end_col) - pl.col(start_col)).dt.total_minutes().alias("Round Duration (min)")
-        ).drop(start_col, end_col)
-
-    # Clean the dataframe with proper null handling and do some basic long formatting
-    df_preprocessed = (
-        clean_date_duration(df_clean)
-        .rename({"+/-":"Score"})
-        .with_columns(
-            Attendance = pl.len().over("PlayerName")
-        )
-    )
-    df_long = df_preprocessed.filter(
-            pl.col("Score").is_not_null()
-        )
+    # Cleaned & long formatted data comes from the shared league store
+    df_long = league.df_long
 
-    mo.accordion({
-        "Data Cleaning Steps":
-        mo.md("""
-        The uploaded data above is cleaned and processed before the analysis below. The cleaning steps include:
-        * check for multiple layouts or courses
-        * converts the start datetime and end datetime to separate Date and Round Duration columns
-        * renames the +/- column as 'Score'
-        * counts the number of rounds played for each player in the data ('Attendance')
-        """)
-    })
-    return df_long, df_preprocessed
+    # Rounds that failed validation are left out of every stat
+    quarantined = league.quarantined.select("PlayerName", "CourseName", "LayoutName", "Date", "Issues")
+
+    mo.vstack([
+        mo.callout(
+            mo.md(f"**{quarantined.height} round(s) failed validation** and are left out of the analysis:"),
+            kind="warn"
+        ) if quarantined.height > 0 else mo.md(""),
+        quarantined if quarantined.height > 0 else mo.md(""),
+        mo.accordion({
+            "Data Cleaning Steps":
+            mo.md(f"""
+            The uploaded data above is cleaned and processed before the analysis below. The cleaning steps include:
+            * check for multiple layouts or courses
+            * converts the start datetime and end datetime to separate Date and Round Duration columns
+            * renames the +/- column as 'Score'
+            * validates each round and leaves out rounds with missing holes, a Total or +/- that doesn't add up,
+              hole scores below 1 or above {validation.MAX_HOLE_SCORE}, a negative duration, no date, or that are duplicates
+            * counts the number of rounds played for each player in the data ('Attendance')
+            """)
+        })
+    ])
+    return (df_long,)
 
 
 @app.cell(hide_code=True)
@@ -155,36 +169,28 @@ def _(courses, layouts, players):
 
 
 @app.cell
-def filter_data(courses, df_long, layouts, players):
-    # Filter data
-    filtered_df = df_long.filter(
-        pl.col("PlayerName").is_in(players.value),
-        pl.col("CourseName").is_in(courses.value), 
-        pl.col("LayoutName").is_in(layouts.value)
-    )
+def filter_data(courses, df_long, layouts, pl, players):
+    # Filter data (with everything selected, reuse the shared league frame rather than copy it)
+    _selection = {"PlayerName": players.value, "CourseName": courses.value, "LayoutName": layouts.value}
+    if all(set(_selected) >= set(df_long[_col].unique()) for _col, _selected in _selection.items()):
+        filtered_df = df_long
+    else:
+        filtered_df = df_long.filter(
+            pl.col(_col).is_in(_selected) for _col, _selected in _selection.items()
+        )
     return (filtered_df,)
 
 
 @app.cell
-def base_chart():
-    # Create chart base theme
-    alt.theme.enable('urbaninstitute')
-
-    # Resuable chart components
-    date_axis=alt.X(
-        "Date:T",
-        title="Date",
-        axis=alt.Axis(
-            format="%b %d, %Y",
-            labelAngle=-45,
-            labelFontSize=11
-        )
-    )
-    return (date_axis,)
+def base_chart(chart_templates):
+    # Chart specs are compiled (validated & serialized) once per process, with the
+    # theme applied; each render below only swaps in new data. See chart_templates.py
+    chart_templates.warm_up()
+    return
 
 
 @app.cell(hide_code=True)
-def _(filtered_df):
+def _(cs, filtered_df, pl):
     # Calculate player statistics
     player_stats = filtered_df.group_by("PlayerName").agg(
         [
@@ -196,8 +202,9 @@ def _(filtered_df):
         ]
     ).with_columns(cs.numeric().round(2))
 
-    # Join with original attendance data for consistency
-    df_with_stats = filtered_df.join(player_stats, on="PlayerName", how="left")
+    # Join with original attendance data for consistency (round-level columns only, the wide
+    # hole columns aren't needed per round here, so they aren't copied into every session)
+    df_with_stats = filtered_df.select(~cs.starts_with("Hole")).join(player_stats, on="PlayerName", how="left")
 
     # Calculate performance relative to player's average
     df_with_stats = df_with_stats.with_columns(
@@ -213,15 +220,19 @@ def _(
     perf_over_time_plots,
     player_stats_by_hole,
     score_attend_plots,
+    season_sim_stats,
+    strokes_gained_stats,
 ):
     tabs = mo.ui.tabs({
         "Data": mo.vstack([
         mo.md("## <br>Selected Player Data & Stats<br>"),
-        df_with_stats.select(~cs.starts_with("Hole"))
+        df_with_stats
     ]),
         "League Ranks: Score & Attendance": score_attend_plots,
         "Performance over Time": perf_over_time_plots,
-        "Hole-by-Hole Analysis": mo.vstack([by_hole_stats, mo.md("-------------"), player_stats_by_hole])
+        "Hole-by-Hole Analysis": mo.vstack([by_hole_stats, mo.md("-------------"), player_stats_by_hole]),
+        "Strokes Gained": strokes_gained_stats,
+        "Season Simulator": season_sim_stats,
     })
 
     mo.vstack([
@@ -237,186 +248,59 @@ def _(
 
 
 @app.cell
-def score_distro_plot(filtered_df):
+def score_distro_plot(chart_templates, filtered_df):
     # Score distribution plots
     ## Bar with point layered on top
-
-    _mean_points = (
-        alt.Chart(filtered_df)
-        .mark_point(filled=True, size=100)
-        .encode(
-            y=alt.Y(
-                "PlayerName:N", 
-                sort=alt.EncodingSortField(
-                 field='Score',
-                 op='mean',
-                 order='ascending'
-                ),
-                title="Player Name"
-            ),
-            x=alt.X(
-                "Score:Q",
-                aggregate="mean",
-                title="Average Score (Relative to Par)"
-            ),
-            color=alt.Color(
-                "mean(Score):Q",
-                scale=alt.Scale(scheme="redyellowgreen", reverse=True),
-                title="Avg Score"
-            ),
-            tooltip=[
-                "PlayerName:N",
-                alt.Tooltip("min(Score):Q", title="Best Score"),
-                alt.Tooltip("max(Score):Q", title="Worst Score"),            
-                alt.Tooltip("mean(Score):Q", title="Avg Score", format=".2f"),
-                alt.Tooltip("stdev(Score):Q", title="Std Dev", format=".2f")
-            ],
-        )
-    )
-
-    _bar = ( 
-        alt.Chart(filtered_df)
-        .mark_bar(cornerRadius=8, height=7)
-        .encode(
-            x=alt.X('min(Score):Q', scale=alt.Scale(domain=[-18, 40]), title='Best Score'),
-            x2=alt.X('max(Score):Q', scale=alt.Scale(domain=[-18, 40]), title='Worst Score'),
-            y=alt.Y(
-                "PlayerName:N", 
-                sort=alt.EncodingSortField(
-                     field='Score',
-                     op='mean',
-                     order='ascending'
-                 ),
-                title="Player Name"
-            ),
-            tooltip=[
-                "PlayerName:N",
-                alt.Tooltip("min(Score):Q", title="Best Score"),
-                alt.Tooltip("max(Score):Q", title="Worst Score"),            
-                alt.Tooltip("mean(Score):Q", title="Avg Score", format=".2f"),
-                alt.Tooltip("stdev(Score):Q", title="Std Dev", format=".2f")
-            ],
-        )
-    )
-
-    _text_min = alt.Chart(filtered_df).mark_text(align='right', color="black", dx=-5).encode(
-        x='min(Score):Q',
-        y=alt.Y(
-            "PlayerName:N", 
-            sort=alt.EncodingSortField(
-                 field='Score',
-                 op='mean',
-                 order='ascending'
-             ),
-            title="Player Name"
-        ),
-        text='min(Score):Q'
-    )
-
-    _text_max = alt.Chart(filtered_df).mark_text(align='left', color="black", dx=5).encode(
-        x='max(Score):Q',
-        y=alt.Y(
-            "PlayerName:N", 
-            sort=alt.EncodingSortField(
-                 field='Score',
-                 op='mean',
-                 order='ascending'
-             ),
-            title="Player Name"
-        ),
-        text='max(Score):Q'
-    )
-
-    avg_score_bars = (_bar + _text_min + _text_max + _mean_points).properties(
-        title=alt.Title(text='Lowest, Avg, & Highest Round Score by Player', 
-        subtitle='Scores relative to Par'),
-        width=800,
-        height=400
-    )
+    avg_score_bars = chart_templates.render("score_range", rounds=filtered_df)
     return (avg_score_bars,)
 
 
 @app.cell
-def _(df_long, player_stats):
+def _(chart_templates, df_long, pl, player_stats):
     # Attendance bar chart
     global_avg = round(df_long['Attendance'].mean(), 2)
 
-    _rule = alt.Chart().mark_rule(
-        color="black",
-        size=3
-    ).encode(
-        x=alt.X(datum=global_avg)
-    )
-
-    _label = _rule.mark_text(
-        x="width",
-        dx=4,
-        align="left",
-        baseline="bottom",
-        text=f"Avg Attendance = {global_avg}", 
-        color="black"
-    )
-
-    player_attendance = (
-        alt.Chart(player_stats)
-        .mark_bar()
-        .encode(
-            y=alt.Y("PlayerName:N", sort="-x", title="Player Name"),
-            x=alt.X("Rounds Played:Q", scale=alt.Scale(round=True), title="Number of Rounds", axis=alt.Axis(format="d")),
-            color="Rounds Played:Q",
-            tooltip=["PlayerName:N", "Rounds Played:Q"],
-        )
+    attend_chart = chart_templates.render(
+        "attendance",
+        players=player_stats,
+        league_avg=pl.DataFrame({
+            "Avg Attendance": [global_avg],
+            "Label": [f"Avg Attendance = {global_avg}"]
+        }),
     )
-
-    attend_chart = (player_attendance + _rule + _label).properties(title="League Attendance", width=800, height=500)
     return (attend_chart,)
 
 
 @app.cell
-def _(hole_analysis):
-    _bar = (
-        alt.Chart(hole_analysis)
-            .mark_bar()
-            .encode(
-            x=alt.X(
-                'count(Hole Outcome):Q',
-                stack="normalize",
-                title="Outcome of Holes Played"
-            ),
-            y='PlayerName:N',
-            color=alt.Color(
-                'Hole Outcome:N',
-                scale=alt.Scale(
-                    domain=['Over Par', 'Par', 'Under Par'],
-                    range=['orangered', 'silver', 'green']
-                )
-            )
-        )
-    )
-
-    _text = ( 
-        alt.Chart(hole_analysis)
-            .mark_text(dx=-15, dy=3, color='white')
-            .encode(
-                x=alt.X('count(Hole Outcome):Q', stack='normalize'),
-                y=alt.Y('PlayerName:N'),
-                detail='Hole Outcome:N',
-                text=alt.Text('count(Hole Outcome):Q')
-            )
-    )
+def _(chart_templates, hole_analysis):
+    player_hole_outcomes_plot = chart_templates.render("player_hole_outcomes", holes=hole_analysis)
+    return (player_hole_outcomes_plot,)
 
 
-    player_hole_outcomes_plot = (_bar + _text).properties(
-        title=alt.Title(text='Player Bird | Par | Bogey Rate', 
-        subtitle='Under Par counts eagles, aces, birdies; Over Par counts anything bogey+'),
-        width=800,
-        height=400
+@app.cell
+def _(confidence, courses, df_long, filtered_df, layouts, league, pl, players):
+    # Head-to-head: bootstrap test of the difference in each pair of players' average round score.
+    # Over every course & layout, the league-wide table is computed once and narrowed to the
+    # selected players; only a narrower course/layout selection re-runs the tests.
+    if set(courses.value) >= set(df_long["CourseName"].unique()) and set(layouts.value) >= set(df_long["LayoutName"].unique()):
+        _pairs = confidence.select_pairs(confidence.league_pairwise(league), players.value)
+    else:
+        _pairs = confidence.pairwise_compare(filtered_df, "PlayerName", "Score")
+    player_comparisons = _pairs.with_columns(
+        pl.col("Mean_Diff", "CI_Low", "CI_High").round(2), pl.col("P_Value", "P_Adjusted").round(3)
     )
-    return (player_hole_outcomes_plot,)
+    return (player_comparisons,)
 
 
 @app.cell
-def _(attend_chart, avg_score_bars, filtered_df, player_hole_outcomes_plot):
+def _(
+    attend_chart,
+    avg_score_bars,
+    filtered_df,
+    pl,
+    player_comparisons,
+    player_hole_outcomes_plot,
+):
     score_attend_plots = mo.vstack([
         mo.md("""
         ## <br>Score & Attendance
@@ -435,16 +319,23 @@ def _(attend_chart, avg_score_bars, filtered_df, player_hole_outcomes_plot):
         filtered_df.filter(pl.col("Attendance") == pl.col("Attendance").max()).select("PlayerName", "Attendance").unique(),
         mo.md(f"<br>* Average round duration: {round(filtered_df["Round Duration (min)"].mean())}  minutes"),
         mo.md("### Graphs"),
-        mo.ui.altair_chart(avg_score_bars),
-        mo.ui.altair_chart(player_hole_outcomes_plot),
+        avg_score_bars,
+        mo.md("""
+        ### Head-to-Head
+        Difference in average round score for each pair of players (Mean_Diff < 0 means the first player scores better),
+        with a 95% bootstrap confidence interval. Significant differences are unlikely to be down to luck,
+        even allowing for the number of pairs compared (Holm-adjusted p-value, P_Adjusted, below 0.05).
+        """),
+        player_comparisons,
+        player_hole_outcomes_plot,
         mo.md("---------------------"),
-        mo.ui.altair_chart(attend_chart),
+        attend_chart,
     ])
     return (score_attend_plots,)
 
 
 @app.cell
-def _(df_with_stats, line_chart, relative_chart):
+def _(df_with_stats, line_chart, pl, relative_chart):
     perf_over_time_plots = mo.vstack([
         mo.md("""
         ## <br>Performance Over Time
@@ -454,20 +345,20 @@ def _(df_with_stats, line_chart, relative_chart):
         """),
         df_with_stats.filter((pl.col("Best Score") - pl.col("Worst Score")) == (pl.col("Best Score") - pl.col("Worst Score")).min()).select(pl.col("PlayerName"), (pl.col("Best Score") - pl.col("Worst Score")).alias("Score Improvement")).unique(),
         mo.md("<br>"),
-        mo.ui.altair_chart(line_chart), 
+        line_chart, 
         mo.md("<br>"),
         mo.md("""### Relative Performance
         Shows how players performed compared to their personal average score each round.<br>
         Each player's average is 0. Each round is scored relative to their average.<br>
         Ideally, this should trend downwards as you improve over time.
         """),
-        mo.ui.altair_chart(relative_chart),
+        relative_chart,
     ])
     return (perf_over_time_plots,)
 
 
 @app.cell
-def time_series_plot(date_axis, filtered_df):
+def time_series_plot(chart_templates, filtered_df, pl):
     # Calculate daily averages for all players
     daily_avg = (
         filtered_df.group_by("Date")
@@ -485,221 +376,78 @@ def time_series_plot(date_axis, filtered_df):
         pl.col("Date"),
         pl.col("PlayerName"),
         pl.col("Score"),
+        pl.col("CourseName"),
+        pl.col("LayoutName"),
         cum_avg=(pl.col("Score").cum_sum() / pl.arange(1, pl.len() + 1)).over("PlayerName"),
     )
 
-    # Base chart for daily averages
-    daily_avg_bars = (
-        alt.Chart(daily_avg)
-        .mark_bar(opacity=0.7, color="blue", width=25)
-        .encode(
-            x=date_axis,
-            y=alt.Y("Daily Avg Score:Q", title="Score (Relative to Par)"),
-            tooltip=[
-                "Date:T",
-                alt.Tooltip("Daily Avg Score:Q", format=".2f", title="Daily Average Score"),
-                "Total Rounds:Q",
-            ],
-        )
-    )
-
-
-    daily_avg_trend = (
-        alt.Chart(daily_avg)
-        .mark_line(
-            opacity=0.5,
-            color="blue",
-        )
-        .encode(
-            x=date_axis,
-            y=alt.Y("Daily Avg Score:Q", title="Score (Relative to Par)"),
-        )
-    )
-
-
-    # Player scores as circles
-    player_scores = (
-        alt.Chart(player_cumulative)
-        .mark_circle(filled=True, opacity=0.4)
-        .encode(
-            x=date_axis,
-            y=alt.Y("Score:Q", title="Score (Relative to Par)"),
-            xOffset="jitter:Q",
-            color="PlayerName:N",
-            tooltip=[
-                "PlayerName:N",
-                "Date:T",
-                "Score:Q",
-                alt.Tooltip("cum_avg:Q", format=".2f", title="Player's Cumulative Average"),
-            ],
-        ).transform_calculate(
-            # Generate uniform jitter
-            jitter='random()'
-        )
-    )
-
-    # Combine all layers
-    line_chart = (
-        (daily_avg_bars + daily_avg_trend + player_scores)
-        .resolve_scale(y="shared")
-        .properties(
-            title=alt.TitleParams(
-                "Player Performance Over Time",
-                subtitle="Blue bars show avg score of all rounds that day (to account for weather conditions), circles show individual scores, line shows trend over time",
-            ),
-            width=800,
-            height=500,
-        )
+    line_chart = chart_templates.render(
+        "performance_over_time",
+        daily_avg=daily_avg,
+        rounds=player_cumulative,
     )
     return (line_chart,)
 
 
 @app.cell
-def player_rel_perf_plot(date_axis, df_with_stats):
+def player_rel_perf_plot(chart_templates, df_with_stats):
     # Relative performance chart
-    yrule = alt.Chart().mark_rule(strokeDash=[12, 6], size=2).encode(y=alt.datum(0))
+    relative_chart = chart_templates.render("relative_performance", rounds=df_with_stats)
+    return (relative_chart,)
 
-    label = yrule.mark_text(
-        x="width", dx=-2, align="right", baseline="bottom", text="Player's Avg."
-    )
 
-    player_performance_over_time = (
-        alt.Chart(df_with_stats)
-        .mark_line(point=True, strokeWidth=2)
-        .encode(
-            x=date_axis,
-            y=alt.Y(
-                "Relative Score to Player Avg:Q",
-                title="Performance (Relative to Player Average)",
-            ),
-            color="PlayerName:N",
-            tooltip=[
-                "PlayerName",
-                "Date:T",
-                "Relative Score to Player Avg:Q",
-                "Score:Q",
-                "Avg Score:Q",
-                "Std Dev:Q",
-            ],
-        )
-    )
+@app.cell
+def _(league):
+    # Get hole-by-hole data (computed once per league in the shared store)
+    hole_analysis = league.hole_analysis
+    return (hole_analysis,)
 
-    relative_chart = (player_performance_over_time + yrule + label).properties(
-        title=alt.TitleParams(
-            "Performance Relative to Player Average",
-            subtitle="Each Player's Avg Score is 0. The y-axis shows round scores as difference from each player's average.",
-        ),
-        width=800,
-        height=500,
-    )
-    return (relative_chart,)
+
+@app.cell
+def _(confidence):
+    ci_method = mo.ui.dropdown(confidence.CI_METHODS, value="bootstrap", label="95% confidence intervals")
+    return (ci_method,)
 
 
 @app.cell
-def _(df_preprocessed):
-    # Get hole-by-hole data
-    by_hole_df = (
-        df_preprocessed
-        .unpivot(
-            index="PlayerName",
-            on=cs.starts_with("Hole"),
-            value_name="ShotsThrown",
-            variable_name="Hole#" 
-        ).with_columns(
-            pl.col("Hole#").str.replace("Hole", "").cast(pl.Int16)
-        )
-    )
-    # Separate par data and player data
-    par_data = by_hole_df.filter(pl.col("PlayerName") == "Par").unique()
-    hole_analysis = ( 
-        by_hole_df
-        .filter(pl.col("PlayerName") != "Par")
-        .join(
-            par_data.select(["Hole#", "ShotsThrown"]).rename({"ShotsThrown": "Par"}),
-            on="Hole#",
-            how="left"
-        ).with_columns(
-            (pl.col("ShotsThrown") - pl.col("Par")).alias("Score_vs_Par"),
-        )
-        .with_columns(
-            (pl.when(pl.col("Score_vs_Par") < 0)
-                .then(pl.lit("Under Par"))
-                .otherwise(
-                    pl.when(pl.col("Score_vs_Par") > 0)
-                    .then(pl.lit("Over Par"))
-                    .otherwise(pl.lit("Par"))
-                )
-            ).alias("Hole Outcome")
-        )
-        .sort("Hole#")
-    )
-    return (hole_analysis,)
+def _(ci_method, confidence, league):
+    # Confidence intervals don't depend on the selection or the sliders below,
+    # so they're computed once per league (and CI method) and shared by every session
+    hole_cis = confidence.league_hole_cis(league, ci_method.value)
+    return (hole_cis,)
 
 
 @app.cell
-def _(hole_analysis, hole_outcomes_plot):
-    # Calculate hole difficulty statistics
+def _(
+    chart_templates,
+    ci_method,
+    cs,
+    hole_cis,
+    hole_outcomes_plot,
+    hole_stats,
+    league,
+):
+    # Hole difficulty statistics (computed once per league in the shared store)
     hole_difficulty = ( 
-        hole_analysis
-        .group_by("Hole#")
-        .agg([
-            pl.mean("Score_vs_Par").round(2).alias("Avg_Score_vs_Par"),
-            pl.count("PlayerName").alias("Total_Players"),
-            pl.max("Score_vs_Par").alias("Worst_Score_vs_Par"),
-            pl.min("Score_vs_Par").alias("Best_Score_vs_Par"),
-            pl.std("Score_vs_Par").round(2).alias("Std_Dev")
-        ])
+        hole_stats.league_hole_stats(league)["hole_difficulty"]
+        # 95% confidence interval of each hole's average
+        .join(
+            hole_cis["by_hole"].select(*hole_stats.LAYOUT_HOLE_COLS, "CI_Low", "CI_High"),
+            on=hole_stats.LAYOUT_HOLE_COLS,
+            how="left"
+        )
         .with_columns(cs.numeric().round(2))
         .sort("Avg_Score_vs_Par")
     )
 
     # Create hole difficulty visualization
-    _mean_points = (
-        alt.Chart(hole_difficulty)
-        .mark_point(filled=True, size=80)
-        .encode(
-            y=alt.Y("Hole#:N", title="Hole Number", sort=alt.SortField("Avg_Score_vs_Par")),
-            x=alt.X("Avg_Score_vs_Par:Q", title="Score vs Par"),
-            color=alt.Color("Avg_Score_vs_Par:Q", 
-                           scale=alt.Scale(scheme="redyellowgreen", domain=[-2, 2], reverse=True),
-                           title="Score vs Par"),
-            tooltip=[
-                "Hole#:N",
-                alt.Tooltip("Avg_Score_vs_Par:Q", title="Avg Score vs Par", format=".2f"),
-                alt.Tooltip("Best_Score_vs_Par:Q", title="Best Score vs Par"),
-                alt.Tooltip("Worst_Score_vs_Par:Q", title="Worst Score vs Par"),
-                "Total_Players:Q"
-            ]
-        )
-    )
-
-    _error_bars = ( 
-        alt.Chart(hole_analysis)
-            .mark_errorbar(color="blue", opacity=0.8, ticks=True)
-            .encode(
-              x=alt.X('Score_vs_Par:Q', scale=alt.Scale(zero=False), title="Score vs Par"),
-              y=alt.Y(
-                  "Hole#:N", 
-                    sort=alt.EncodingSortField(
-                         field='Avg_Score_vs_Par',
-                         order='ascending'
-                     ),
-                    title="Hole Number"
-                ),
-            )
-    )
-
-    hole_chart = (_error_bars + _mean_points).properties(
-        title=alt.Title(text='Hole Difficulty', 
-        subtitle='Scores relative to Par'),
-        width=800,
-        height=500
-    )
+    hole_chart = chart_templates.render("hole_difficulty", holes=hole_difficulty)
 
 
     # Output
     by_hole_stats = mo.vstack([
         mo.md("## <br>Hole Difficulty Analysis"),
+        ci_method,
         hole_difficulty,
         mo.md("### Graphs"), 
         hole_outcomes_plot,
@@ -708,74 +456,61 @@ def _(hole_analysis, hole_outcomes_plot):
     return by_hole_stats, hole_difficulty
 
 
-@app.cell
-def _(hole_analysis, hole_difficulty):
-    # Calculate each player's performance on each hole relative to par
-    player_hole_performance = hole_analysis.group_by(["PlayerName", "Hole#"]).agg([
-        pl.mean("Score_vs_Par").round(2).alias("Avg_Score_vs_Par"),
-        pl.std("Score_vs_Par").round(2).alias("SD_Score_vs_Par"),
-        pl.len().alias("Rounds_Played"),
-        pl.min("Score_vs_Par").alias("Best_Score_vs_Par"),
-        pl.max("Score_vs_Par").alias("Worst_Score_vs_Par")
-    ]).sort(["PlayerName", "Hole#"])
-
-    # Find best and worst holes for each player
-    player_best_holes = player_hole_performance.group_by("PlayerName").agg([
-        pl.min("Avg_Score_vs_Par").alias("Best_Hole_Performance"),
-        pl.col("Hole#").filter(pl.col("Avg_Score_vs_Par") == pl.min("Avg_Score_vs_Par")).alias("Best_Holes")
-    ])
+@app.cell(hide_code=True)
+def _():
+    # Controls for the best & nemesis holes table
+    extreme_holes_k = mo.ui.slider(1, 5, value=1, label="Holes per player")
+    extreme_min_rounds = mo.ui.slider(1, 10, value=1, label="Min. rounds on hole")
+    return extreme_holes_k, extreme_min_rounds
 
-    player_worst_holes = player_hole_performance.group_by("PlayerName").agg([
-        pl.max("Avg_Score_vs_Par").alias("Worst_Hole_Performance"),
-        pl.col("Hole#").filter(pl.col("Avg_Score_vs_Par") == pl.max("Avg_Score_vs_Par")).alias("Nemesis_Holes")
-    ])
 
-    # Combine best and worst hole analysis
-    player_extremes = player_best_holes.join(
-        player_worst_holes, 
-        on="PlayerName", 
-        how="left"
-    ).with_columns([
-        cs.numeric().round(2)
-    ])
+@app.cell
+def _(chart_templates, hole_cis, hole_difficulty, hole_stats, league, pl):
+    # Each player's performance on each hole relative to par (computed once per league in the shared store)
+    player_hole_performance = hole_stats.league_hole_stats(league)["player_hole_performance"]
 
     # Create heatmap of player performance by hole
     heatmap_data = ( 
         player_hole_performance
             .filter(pl.col("Rounds_Played") >= 1)  # Only holes with data
             .join(
-                hole_difficulty.select("Hole#", "Avg_Score_vs_Par").rename({"Avg_Score_vs_Par":"Hole_Avg_vs_Par"}),
+                hole_difficulty.select(*hole_stats.LAYOUT_HOLE_COLS, "Avg_Score_vs_Par").rename({"Avg_Score_vs_Par":"Hole_Avg_vs_Par"}),
                 how="left", 
-                on="Hole#"
+                on=hole_stats.LAYOUT_HOLE_COLS
             )
+            # 95% CI per player & hole, null when only played once
+            .join(
+                hole_cis["by_player_hole"].select("PlayerName", *hole_stats.LAYOUT_HOLE_COLS, "CI_Low", "CI_High"),
+                how="left",
+                on=["PlayerName", *hole_stats.LAYOUT_HOLE_COLS]
+            )
+            .with_columns(pl.col("CI_Low", "CI_High").round(2))
     )
 
-    player_heatmap = (
-        alt.Chart(heatmap_data)
-        .mark_rect()
-        .encode(
-            x=alt.X("Hole#:N", title="Hole Number"),
-            y=alt.Y("PlayerName:N", title="PlayerName"),
-            color=alt.Color("Avg_Score_vs_Par:Q", 
-                           scale=alt.Scale(scheme="redyellowgreen", domain=[-2, 3], reverse=True),
-                           title="Avg Score vs Par"),
-            tooltip=[
-                "PlayerName:N",
-                "Hole#:N",
-                alt.Tooltip("Avg_Score_vs_Par:Q", title="Player's Avg Score vs Par"),
-                alt.Tooltip("Hole_Avg_vs_Par:Q", title="Hole's Avg Score vs. Par (all players)"),
-                alt.Tooltip("Rounds_Played:Q", title="Rounds Played")
-            ]
-        )
-        .properties(
-            title="Player Performance by Hole (Heatmap)",
-            width=800,
-            height=500
-        )
+    player_heatmap = chart_templates.render("player_hole_heatmap", cells=heatmap_data)
+    return player_heatmap, player_hole_performance
+
+
+@app.cell
+def _(
+    extreme_holes_k,
+    extreme_min_rounds,
+    hole_stats,
+    player_heatmap,
+    player_hole_performance,
+):
+    # Find each player's best and worst (nemesis) holes, ties included;
+    # only the ranking re-runs when a slider moves
+    player_extremes = hole_stats.rank_player_holes(
+        player_hole_performance,
+        k=extreme_holes_k.value,
+        min_rounds=extreme_min_rounds.value,
+        by=["PlayerName", "CourseName", "LayoutName"],
     )
 
     player_stats_by_hole = mo.vstack([
         mo.md("## <br>Each Player's Best & Nemesis Holes"),
+        mo.hstack([extreme_holes_k, extreme_min_rounds], justify="start"),
         player_extremes,
         mo.md("### Graphs"),
         player_heatmap      
@@ -784,46 +519,90 @@ def _(hole_analysis, hole_difficulty):
 
 
 @app.cell
-def _(hole_analysis):
-    _bar = (
-        alt.Chart(hole_analysis)
-            .mark_bar()
-            .encode(
-            x=alt.X(
-                'count(Hole Outcome):Q',
-                stack="normalize",
-                title="Outcome of Holes Played"
-            ),
-            y=alt.Y('Hole#:N', title="Hole Number"),
-            color=alt.Color(
-                'Hole Outcome:N',
-                scale=alt.Scale(
-                    domain=['Over Par', 'Par', 'Under Par'],
-                    range=['orangered', 'silver', 'green']
-                )
-            )
+def _(chart_templates, hole_analysis):
+    hole_outcomes_plot = chart_templates.render("hole_outcomes", holes=hole_analysis)
+    return (hole_outcomes_plot,)
+
+
+@app.cell
+def _(chart_templates, courses, layouts, league, pl, players, strokes_gained):
+    # Strokes gained vs the field, computed once per league & then filtered to the selection
+    sg_tables = strokes_gained.league_strokes_gained(league)
+    _selected = [
+        pl.col("PlayerName").is_in(players.value),
+        pl.col("CourseName").is_in(courses.value),
+        pl.col("LayoutName").is_in(layouts.value)
+    ]
+    sg_by_round = sg_tables["by_round"].filter(*_selected)
+    sg_by_player_hole = sg_tables["by_player_hole"].filter(*_selected)
+
+    sg_summary = (
+        sg_by_round
+        .group_by("PlayerName")
+        .agg(
+            pl.mean("Strokes_Gained").round(2).alias("Avg_Strokes_Gained_per_Round"),
+            pl.sum("Strokes_Gained").round(2).alias("Total_Strokes_Gained"),
+            pl.len().alias("Rounds_Played"),
         )
+        .sort("Avg_Strokes_Gained_per_Round", descending=True)
     )
 
-    _text = ( 
-        alt.Chart(hole_analysis)
-            .mark_text(dx=-15, dy=3, color='white')
-            .encode(
-                x=alt.X('count(Hole Outcome):Q', stack='normalize'),
-                y=alt.Y('Hole#:N', title="Hole Number"),
-                detail='Hole Outcome:N',
-                text=alt.Text('count(Hole Outcome):Q')
-            )
-    )
+    sg_heatmap = chart_templates.render("strokes_gained_heatmap", cells=sg_by_player_hole)
+    sg_round_chart = chart_templates.render("strokes_gained_rounds", rounds=sg_by_round)
+
+    strokes_gained_stats = mo.vstack([
+        mo.md("""
+        ## <br>Strokes Gained
+        How many throws each player gains (or loses) on each hole compared with the average of everyone else who played it that night.
+        """),
+        sg_summary,
+        mo.md("### Graphs"),
+        sg_heatmap,
+        sg_round_chart,
+    ])
+    return (strokes_gained_stats,)
 
 
-    hole_outcomes_plot = (_bar + _text).properties(
-        title=alt.Title(text='Hole Bird | Par | Bogey Rate', 
-        subtitle='Under Par counts eagles, aces, birdies; Over Par counts anything bogey+'),
-        width=800,
-        height=400
-    )
-    return (hole_outcomes_plot,)
+@app.cell
+def _(season_sim):
+    # Controls for the season simulator
+    season_rounds = mo.ui.number(1, 30, value=season_sim.SEASON_ROUNDS, label="League nights in the season")
+    rounds_counted = mo.ui.number(1, 30, value=1, label="Rounds counted (sum of best)")
+    return rounds_counted, season_rounds
+
+
+@app.cell
+def _(league, pl, rounds_counted, season_rounds, season_sim):
+    # Simulated final standings for the whole league (not the player/course selection),
+    # computed once per league & season settings and shared by every session
+    _best_of = min(rounds_counted.value, season_rounds.value)
+    _sim = season_sim.league_season_sim(league, season_rounds.value, _best_of)
+    standings_now = _sim["standings_now"]
+    standings_sim = _sim["standings_sim"].select(
+        "PlayerName", pl.col("Win_Prob", "Podium_Prob").round(3), pl.col("Avg_Place").round(2)
+    )
+    rule_comparison = (
+        _sim["rule_comparison"]
+        .pivot("Rule", index="PlayerName", values="Win_Prob")
+        .with_columns(pl.exclude("PlayerName").round(3))
+    )
+
+    season_sim_stats = mo.vstack([
+        mo.md(f"""
+        ## <br>Season Simulator
+        Plays out the rest of the season {season_sim.N_TRIALS:,} times. In each simulated league night a player turns up
+        as often as they have so far and shoots one of their own past rounds (give or take a throw or so).
+        The season score is the sum of each player's best rounds (1 = the league's best round rule), with more attendance winning a tie.
+        """),
+        mo.hstack([season_rounds, rounds_counted], justify="start"),
+        mo.md("### Standings so far"),
+        standings_now,
+        mo.md("### Final standings: chance of winning, finishing in the top 3 & average place"),
+        standings_sim,
+        mo.md("### Chance of winning under different rules (dropping each player's worst N rounds)"),
+        rule_comparison,
+    ])
+    return rule_comparison, season_sim_stats, standings_now, standings_sim
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+import polars as pl
+
+import league_store
+
+# Identifies a hole: hole 5 of two different layouts are different holes
+LAYOUT_HOLE_COLS = ["CourseName", "LayoutName", "Hole#"]
+
+# Best & nemesis holes
+# Ranks every (player, hole) row within its player in a single pass: both dense
+# ranks are window expressions evaluated together over one sort of each player
+# partition, so there's no per-player list building or second group_by/join.
+# Dense ranking keeps ties together, i.e. with k=1 every hole sharing a player's
+# best average is returned, each with Rank 1.
+def rank_player_holes(
+    player_hole_performance: pl.DataFrame | pl.LazyFrame,
+    k: int = 1,
+    min_rounds: int = 1,
+    by: str | list[str] = "PlayerName",
+    hole_col: str = "Hole#",
+    score_col: str = "Avg_Score_vs_Par",
+) -> pl.DataFrame:
+    by = [by] if isinstance(by, str) else list(by)
+    ranked = (
+        player_hole_performance.lazy()
+        # Only rank holes the player has played often enough
+        .filter(pl.col("Rounds_Played") >= min_rounds, pl.col(score_col).is_not_null())
+        .with_columns(
+            pl.col(score_col).rank("dense").over(by).alias("Best"),
+            pl.col(score_col).rank("dense", descending=True).over(by).alias("Nemesis"),
+        )
+        .filter((pl.col("Best") <= k) | (pl.col("Nemesis") <= k))
+    )
+
+    # One row per (player, Best/Nemesis, rank, hole)
+    return (
+        ranked.unpivot(
+            index=[*by, hole_col, score_col, "Rounds_Played"],
+            on=["Best", "Nemesis"],
+            variable_name="Extreme",
+            value_name="Rank",
+        )
+        .filter(pl.col("Rank") <= k)
+        .select(*by, "Extreme", "Rank", hole_col, score_col, "Rounds_Played")
+        .sort([*by, "Extreme", "Rank", hole_col])
+        .collect()
+    )
+
+
+def hole_difficulty(hole_analysis: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+    # League-wide difficulty of each hole of each layout (score vs par over every player's rounds)
+    return (
+        hole_analysis.lazy()
+        .group_by(LAYOUT_HOLE_COLS)
+        .agg([
+            pl.mean("Score_vs_Par").round(2).alias("Avg_Score_vs_Par"),
+            pl.count("PlayerName").alias("Total_Players"),
+            pl.max("Score_vs_Par").alias("Worst_Score_vs_Par"),
+            pl.min("Score_vs_Par").alias("Best_Score_vs_Par"),
+            pl.std("Score_vs_Par").round(2).alias("Std_Dev")
+        ])
+        .collect()
+    )
+
+
+def player_hole_performance(hole_analysis: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+    # Each player's performance on each hole of each layout relative to par
+    # (per course & layout, so e.g. hole 5 of two different layouts isn't merged)
+    player_hole = ["PlayerName", *LAYOUT_HOLE_COLS]
+    return (
+        hole_analysis.lazy()
+        .group_by(player_hole)
+        .agg([
+            pl.mean("Score_vs_Par").round(2).alias("Avg_Score_vs_Par"),
+            pl.std("Score_vs_Par").round(2).alias("SD_Score_vs_Par"),
+            pl.len().alias("Rounds_Played"),
+            pl.min("Score_vs_Par").alias("Best_Score_vs_Par"),
+            pl.max("Score_vs_Par").alias("Worst_Score_vs_Par")
+        ])
+        .sort(player_hole)
+        .collect()
+    )
+
+
+def league_hole_stats(league: league_store.LeagueData) -> dict[str, pl.DataFrame]:
+    # Hole tables that only depend on the league, computed once per data version and shared
+    def build(league: league_store.LeagueData) -> dict[str, pl.DataFrame]:
+        return {
+            "hole_difficulty": hole_difficulty(league.hole_analysis),
+            "player_hole_performance": player_hole_performance(league.hole_analysis),
+        }
+
+    return league_store.derived(league, "hole_stats", build)
@@ -0,0 +1,254 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import polars as pl
+import polars.selectors as cs
+
+import validation
+
+# Process-wide store of cleaned league data.
+# marimo runs every session of an app in the same server process, so anything
+# cached at module level here is loaded once and shared by all viewers.
+# The frames are treated as read-only: sessions only ever derive new frames
+# from them (filter/select/join), which reuse the underlying Arrow buffers.
+
+# Max number of distinct leagues (uploads) kept in memory at once
+MAX_LEAGUES = 16
+
+# Optional on-disk snapshots of every league loaded, so a restarted server can
+# reopen them straight away (memory-mapped) without a re-upload. Off unless set.
+# A session only ever gets a league it uploaded or asked for by key (see
+# find_league), never someone else's league by default.
+SNAPSHOT_DIR = os.environ.get("DG_SNAPSHOT_DIR")
+
+# League keys are hex digests; anything else (e.g. a path) is never looked up
+_KEY_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+_store: "OrderedDict[str, LeagueData]" = OrderedDict()
+# Tables derived from a league, cached alongside it: (league key, name) -> table
+_derived: dict[tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class LeagueData:
+    key: str
+    df_clean: pl.DataFrame
+    df_preprocessed: pl.DataFrame
+    df_long: pl.DataFrame
+    hole_analysis: pl.DataFrame
+    # Rounds that failed validation, with the reasons in `Issues`
+    quarantined: pl.DataFrame
+
+
+# clean the date times
+def clean_date_duration(df: pl.DataFrame | pl.LazyFrame, start_col: str = "StartDate", end_col: str = "EndDate") -> pl.DataFrame | pl.LazyFrame:
+    return df.with_columns(
+        pl.col(start_col).cast(pl.Date).alias("Date"),
+        (pl.col(end_col) - pl.col(start_col)).dt.total_minutes().alias("Round Duration (min)")
+    ).drop(start_col, end_col)
+
+
+def preprocess(df_clean: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
+    # Clean the dataframe with proper null handling and do some basic long formatting,
+    # then quarantine rounds that fail validation -> (valid rounds, quarantined rounds)
+    checked = validation.check_rounds(
+        clean_date_duration(df_clean).rename({"+/-": "Score"})
+    )
+    df_valid, quarantined = validation.split_rounds(checked)
+    return df_valid.with_columns(Attendance=pl.len().over("PlayerName")), quarantined
+
+
+# Columns identifying a round that are kept on every hole-by-hole row
+ROUND_COLS = ["PlayerName", "CourseName", "LayoutName", "Date"]
+
+
+def build_hole_analysis(df_preprocessed: pl.DataFrame) -> pl.DataFrame:
+    # Get hole-by-hole data
+    by_hole_df = (
+        df_preprocessed
+        .unpivot(
+            index=ROUND_COLS,
+            on=cs.starts_with("Hole"),
+            value_name="ShotsThrown",
+            variable_name="Hole#"
+        ).with_columns(
+            pl.col("Hole#").str.replace("Hole", "").cast(pl.Int16)
+        )
+    )
+    # Separate par data (one row per layout & hole) and player data
+    par_data = (
+        by_hole_df
+        .filter(pl.col("PlayerName") == "Par")
+        .select(["CourseName", "LayoutName", "Hole#", "ShotsThrown"])
+        .unique(["CourseName", "LayoutName", "Hole#"], keep="last", maintain_order=True)
+    )
+    return (
+        by_hole_df
+        .filter(pl.col("PlayerName") != "Par")
+        .join(
+            par_data.rename({"ShotsThrown": "Par"}),
+            on=["CourseName", "LayoutName", "Hole#"],
+            how="left"
+        ).with_columns(
+            (pl.col("ShotsThrown") - pl.col("Par")).alias("Score_vs_Par"),
+        )
+        .with_columns(
+            (pl.when(pl.col("Score_vs_Par") < 0)
+                .then(pl.lit("Under Par"))
+                .otherwise(
+                    pl.when(pl.col("Score_vs_Par") > 0)
+                    .then(pl.lit("Over Par"))
+                    .otherwise(pl.lit("Par"))
+                )
+            ).alias("Hole Outcome")
+        )
+        .sort("Hole#")
+    )
+
+
+def league_key(contents: Iterable[bytes]) -> str:
+    # Same set of files -> same key, regardless of upload order
+    digests = sorted(hashlib.sha256(c).hexdigest() for c in contents)
+    return hashlib.sha256("".join(digests).encode()).hexdigest()[:16]
+
+
+def _build_league(key: str, contents: list[bytes]) -> LeagueData:
+    # Read each CSV file (in a stable order) and concatenate them vertically
+    ordered = sorted(contents, key=lambda c: hashlib.sha256(c).hexdigest())
+    df_clean = pl.concat([pl.read_csv(c, try_parse_dates=True) for c in ordered])
+    return _league_from_clean(key, df_clean)
+
+
+def _league_from_clean(key: str, df_clean: pl.DataFrame) -> LeagueData:
+    df_preprocessed, quarantined = preprocess(df_clean)
+    df_long = df_preprocessed.filter(pl.col("Score").is_not_null())
+    hole_analysis = build_hole_analysis(df_preprocessed)
+
+    return LeagueData(
+        key=key,
+        df_clean=df_clean,
+        df_preprocessed=df_preprocessed,
+        df_long=df_long,
+        hole_analysis=hole_analysis,
+        quarantined=quarantined,
+    )
+
+
+def _cached(key: str) -> LeagueData | None:
+    # Caller holds _lock
+    league = _store.get(key)
+    if league is not None:
+        _store.move_to_end(key)
+    return league
+
+
+def _add(league: LeagueData) -> LeagueData:
+    # Caller holds _lock. Another session may have built the same league meanwhile; keep the first one
+    if league.key in _store:
+        return _cached(league.key)
+    _store[league.key] = league
+    # Evict the least recently used league once we're over the limit
+    while len(_store) > MAX_LEAGUES:
+        evicted, _ = _store.popitem(last=False)
+        for derived_key in [k for k in _derived if k[0] == evicted]:
+            del _derived[derived_key]
+    return league
+
+
+def load_league(contents: Iterable[bytes]) -> LeagueData:
+    # Return the shared data for these uploaded files, loading them only on first use
+    contents = list(contents)
+    key = league_key(contents)
+    with _lock:
+        league = _cached(key)
+    if league is not None:
+        return league
+
+    # Build outside the lock, so one upload doesn't hold up every other session
+    built = _build_league(key, contents)
+    with _lock:
+        league = _add(built)
+    # Only the session that built the league writes its snapshot, outside the lock
+    if league is built and SNAPSHOT_DIR:
+        save_snapshot(league, SNAPSHOT_DIR)
+    return league
+
+
+def write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    # Write to a temporary file & rename it over `path`, so readers never see a partial file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def save_snapshot(league: LeagueData, snapshot_dir: str | Path) -> Path:
+    # Write the league's raw rounds as Arrow IPC and mark it as the latest
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{league.key}.arrow"
+    write_atomic(path, league.df_clean.write_ipc)
+    write_atomic(snapshot_dir / "latest", lambda tmp: tmp.write_text(league.key))
+    return path
+
+
+def restore_snapshot(snapshot_dir: str | Path | None = SNAPSHOT_DIR, key: str | None = None) -> LeagueData | None:
+    # Load a snapshot (default: the latest one) into the store, if there is one
+    # (uncompressed IPC files are memory-mapped). Used to warm the server up at start-up.
+    if not snapshot_dir:
+        return None
+    if key is None:
+        latest = Path(snapshot_dir) / "latest"
+        if not latest.exists():
+            return None
+        key = latest.read_text().strip()
+    if not _KEY_PATTERN.fullmatch(key):
+        return None
+    path = Path(snapshot_dir) / f"{key}.arrow"
+    if not path.exists():
+        return None
+    with _lock:
+        league = _cached(key)
+    if league is None:
+        built = _league_from_clean(key, pl.read_ipc(path))
+        with _lock:
+            league = _add(built)
+    return league
+
+
+def find_league(key: str) -> LeagueData | None:
+    # A league by its key: already loaded in this process, or else from its snapshot
+    if not _KEY_PATTERN.fullmatch(key):
+        return None
+    with _lock:
+        league = _cached(key)
+    return league or restore_snapshot(SNAPSHOT_DIR, key)
+
+
+def derived(league: LeagueData, name: str, build: Callable[[LeagueData], Any]) -> Any:
+    # Compute a table from a league once per data version (the league key) and share it
+    with _lock:
+        if (league.key, name) in _derived:
+            return _derived[(league.key, name)]
+    table = build(league)
+    with _lock:
+        # Only cache for a league that's in the store: tables of a league that was never
+        # added (or was evicted meanwhile) would otherwise never be cleared
+        if league.key not in _store:
+            return table
+        # Another session may have built it meanwhile; keep the first one
+        return _derived.setdefault((league.key, name), table)
+
+
+def loaded_leagues() -> list[str]:
+    with _lock:
+        return list(_store)
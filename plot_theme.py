@@ -4,7 +4,6 @@ import altair as alt
 score_color_scale = alt.Scale(
     domain=[-5, -2, 0, 2, 5, 10],
     range=["#2ecc71", "#27ae60", "#f39c12", "#e67e22", "#e74c3c", "#c0392b"],
-    name="score_colors",
 )
 
 # Enhanced tooltip formatting
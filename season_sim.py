@@ -0,0 +1,242 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import polars as pl
+
+import league_store
+
+# Season standings simulation
+# League rules (as in Glow Standings.csv): a season is a fixed number of league
+# nights, a player's season score is their best round (lowest +/-), and more
+# attendance wins a tie. `best_of` generalises that to the sum of a player's
+# best N rounds; "drop the worst N" over a full season is best_of = rounds - N.
+# Players with fewer rounds than count are ranked below those with enough.
+#
+# Each simulated season plays the remaining nights: a player turns up with
+# their attendance rate so far and, when they do, shoots a round drawn from
+# their own past scores plus a little rounded Gaussian noise (JITTER, in throws),
+# so a player can beat their past best now and then; jitter=0 only resamples
+# the past rounds. All trials of a batch are drawn as one
+# (trials x players x rounds) array; batches are split across a process pool.
+#
+# The pool is created on first use and reused by every later simulation; it's
+# only replaced by a bigger one when a simulation asks for more workers. The
+# notebook runs inside marimo's multi-threaded server, where fork() can copy a
+# lock held by another thread (e.g. polars' thread pool) and deadlock, so the
+# workers are started with "spawn".
+
+SEED = 42
+SEASON_ROUNDS = 8
+N_TRIALS = 100_000
+# Trials per rule when comparing league rules (several simulations at once)
+RULE_TRIALS = 20_000
+# Std dev (throws) of the noise added to each resampled round
+JITTER = 1.0
+# Cap on the number of simulated rounds held in memory per batch
+MAX_DRAWS = 5_000_000
+# Below this many trials, starting worker processes costs more than it saves
+MIN_TRIALS_PER_WORKER = 10_000
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    # A pool of at least `workers` processes. A bigger one from an earlier call is
+    # reused: a simulation only ever submits `workers` batches, so it never runs on more.
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                # Batches already submitted to the old pool still finish
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool() -> None:
+    # Drop a pool whose worker died, so the next simulation starts a fresh one
+    global _pool, _pool_workers
+    with _pool_lock:
+        _pool, _pool_workers = None, 0
+
+
+def _season_arrays(df: pl.DataFrame, season_rounds: int) -> dict:
+    # Everything a worker needs, as plain numpy arrays (cheap to pickle)
+    rounds = df.select("PlayerName", "Date", "Score").drop_nulls("Score").sort("PlayerName", "Date")
+    players = rounds.group_by("PlayerName", maintain_order=True).agg(pl.col("Score"), pl.len().alias("Attendance"))
+    played = rounds["Date"].n_unique()
+    counts = players["Attendance"].to_numpy().astype(np.int64)
+
+    # Past rounds, padded with +inf so they sort after any real score
+    past = np.full((len(counts), max(counts.max(initial=0), 1)), np.inf)
+    for i, scores in enumerate(players["Score"].to_list()):
+        past[i, :len(scores)] = scores
+
+    return {
+        "names": players["PlayerName"].to_list(),
+        "scores": rounds["Score"].to_numpy().astype(np.float64),
+        "starts": np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64),
+        "counts": counts,
+        "attend_rate": np.minimum(counts / max(played, 1), 1.0),
+        "past": past,
+        "remaining": max(season_rounds - played, 0),
+    }
+
+
+def _rank(totals: np.ndarray, counted: np.ndarray, attendance: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # Place (0 = first) of every player in every trial; all inputs are (trials x players).
+    # Most rounds counted, then lowest total, then most attendance, then a coin toss.
+    order = np.lexsort((rng.random(totals.shape), -attendance, totals, -counted), axis=-1)
+    places = np.empty_like(order)
+    np.put_along_axis(places, order, np.arange(order.shape[1])[None, :], axis=-1)
+    return places
+
+
+def _simulate_batch(season: dict, best_of: int, jitter: float, n_trials: int, seed: np.random.SeedSequence) -> np.ndarray:
+    # Place counts -> shape (players, places)
+    rng = np.random.default_rng(seed)
+    n_players = len(season["counts"])
+    remaining = season["remaining"]
+    batch = max(1, MAX_DRAWS // max(n_players * (remaining + season["past"].shape[1]), 1))
+    place_counts = np.zeros((n_players, n_players), dtype=np.int64)
+
+    for lo in range(0, n_trials, batch):
+        trials = min(batch, n_trials - lo)
+        shape = (trials, n_players, remaining)
+        attends = rng.random(shape) < season["attend_rate"][None, :, None]
+        # Each future round is drawn uniformly from the player's own past scores
+        idx = season["starts"][None, :, None] + (rng.random(shape) * season["counts"][None, :, None]).astype(np.int64)
+        future = season["scores"][idx]
+        if jitter > 0:
+            future += np.rint(rng.normal(0, jitter, shape))
+        future = np.where(attends, future, np.inf)
+
+        rounds = np.concatenate([np.broadcast_to(season["past"], (trials, *season["past"].shape)), future], axis=-1)
+        best = np.sort(rounds, axis=-1)[..., :best_of]
+        played = np.isfinite(best)
+        totals = np.where(played, best, 0).sum(axis=-1)
+        counted = played.sum(axis=-1)
+        attendance = season["counts"][None, :] + attends.sum(axis=-1)
+
+        places = _rank(totals, counted, attendance, rng)
+        place_counts += np.stack([np.bincount(p, minlength=n_players) for p in places.T])
+    return place_counts
+
+
+def simulate_standings(
+    df: pl.DataFrame,
+    season_rounds: int = SEASON_ROUNDS,
+    best_of: int = 1,
+    n_trials: int = N_TRIALS,
+    jitter: float = JITTER,
+    seed: int = SEED,
+    workers: int | None = None,
+) -> pl.DataFrame:
+    # Monte Carlo final standings from the rounds played so far (one row per player & round, e.g. df_long).
+    # -> Win_Prob, Podium_Prob & Avg_Place per player, plus the probability of every place (Place_1, ...)
+    season = _season_arrays(df, season_rounds)
+    n_players = len(season["names"])
+    if n_players == 0:
+        return pl.DataFrame(
+            schema={"PlayerName": pl.String, "Win_Prob": pl.Float64, "Podium_Prob": pl.Float64, "Avg_Place": pl.Float64}
+        )
+
+    workers = workers or os.cpu_count() or 1
+    n_shards = max(1, min(workers, n_trials // MIN_TRIALS_PER_WORKER))
+    shard_trials = [len(s) for s in np.array_split(np.arange(n_trials), n_shards)]
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    place_counts = None
+    if n_shards > 1:
+        try:
+            place_counts = sum(_get_pool(n_shards).map(
+                _simulate_batch, [season] * n_shards, [best_of] * n_shards, [jitter] * n_shards, shard_trials, seeds
+            ))
+        except BrokenProcessPool:
+            _reset_pool()
+    if place_counts is None:
+        # Same shards & seeds in this process, so the result doesn't depend on where it ran
+        place_counts = sum(
+            _simulate_batch(season, best_of, jitter, trials, shard_seed)
+            for trials, shard_seed in zip(shard_trials, seeds)
+        )
+
+    place_probs = place_counts / n_trials
+    return pl.DataFrame({
+        "PlayerName": season["names"],
+        "Win_Prob": place_probs[:, 0],
+        "Podium_Prob": place_probs[:, :3].sum(axis=1),
+        "Avg_Place": place_probs @ np.arange(1, n_players + 1),
+    }).hstack(
+        pl.DataFrame(place_probs, schema=[f"Place_{i}" for i in range(1, n_players + 1)])
+    ).sort("Win_Prob", "Avg_Place", descending=[True, False])
+
+
+def current_standings(df: pl.DataFrame, best_of: int = 1) -> pl.DataFrame:
+    # Standings from the rounds played so far, ranked by the same rules as the simulation
+    return (
+        df.drop_nulls("Score")
+        .group_by("PlayerName")
+        .agg(
+            pl.col("Score").sort().head(best_of).sum().alias("Season_Score"),
+            pl.col("Score").sort().head(best_of).len().alias("Rounds_Counted"),
+            pl.len().alias("Attendance"),
+        )
+        .sort(
+            ["Rounds_Counted", "Season_Score", "Attendance", "PlayerName"],
+            descending=[True, False, True, False],
+        )
+        .with_row_index("Place", offset=1)
+    )
+
+
+def rule_best_of(season_rounds: int, drop_worst: list[int]) -> dict[str, int]:
+    # Rule name -> rounds counted: the best round rule plus each drop-worst-N rule that still counts 2+ rounds
+    return {"Best round": 1} | {
+        f"Drop worst {n}": season_rounds - n for n in drop_worst if 1 < season_rounds - n
+    }
+
+
+def compare_rules(
+    df: pl.DataFrame,
+    season_rounds: int = SEASON_ROUNDS,
+    drop_worst: list[int] = (0, 1, 2),
+    n_trials: int = N_TRIALS,
+    jitter: float = JITTER,
+    seed: int = SEED,
+    workers: int | None = None,
+) -> pl.DataFrame:
+    # Win & podium probabilities under the best round rule and each drop-worst-N rule, long format
+    rules = rule_best_of(season_rounds, drop_worst)
+    return pl.concat([
+        simulate_standings(df, season_rounds, best_of, n_trials, jitter, seed, workers)
+        .select("PlayerName", "Win_Prob", "Podium_Prob", "Avg_Place")
+        .with_columns(Rule=pl.lit(rule))
+        for rule, best_of in rules.items()
+    ])
+
+
+def league_season_sim(league: league_store.LeagueData, season_rounds: int = SEASON_ROUNDS, best_of: int = 1) -> dict[str, pl.DataFrame]:
+    # Standings so far, simulated final standings & the rule comparison for a league's rounds,
+    # computed once per league & season settings and shared
+    standings = league_store.derived(
+        league,
+        f"season_sim_{season_rounds}_{best_of}",
+        lambda league: {
+            "standings_now": current_standings(league.df_long, best_of),
+            "standings_sim": simulate_standings(league.df_long, season_rounds, best_of),
+        },
+    )
+    # Doesn't depend on the rounds counted, so it's shared between those settings
+    rules = league_store.derived(
+        league,
+        f"season_rules_{season_rounds}",
+        lambda league: compare_rules(league.df_long, season_rounds, n_trials=RULE_TRIALS),
+    )
+    return standings | {"rule_comparison": rules}
@@ -0,0 +1,55 @@
+import argparse
+import time
+from pathlib import Path
+
+import marimo
+
+# Warm start server
+# `marimo run` starts every viewer's session as a kernel thread inside one server
+# process. Doing the expensive start-up work here, once, before the server takes
+# connections means each new session starts warm:
+#   * polars/numpy/altair & our modules are already in sys.modules, so the
+#     notebook's `imports` cell is instant
+#   * every chart spec is already validated & serialized (chart_templates)
+#   * with DG_SNAPSHOT_DIR set, the last league is already loaded (league_store),
+#     ready for sessions that open it by key (?league=<key>)
+#
+# Usage:
+#   DG_SNAPSHOT_DIR=.snapshots uv run python serve.py --port 2718
+
+NOTEBOOK = Path(__file__).parent / "dg_analysis_nb.py"
+
+
+def warm_up() -> None:
+    start = time.perf_counter()
+    import polars  # noqa: F401
+    import polars.selectors  # noqa: F401
+    import numpy  # noqa: F401
+    import chart_templates
+    import confidence  # noqa: F401
+    import hole_stats  # noqa: F401
+    import season_sim  # noqa: F401
+    import league_store
+    import strokes_gained  # noqa: F401
+
+    chart_templates.warm_up()
+    league = league_store.restore_snapshot()
+    restored = f", restored league {league.key}" if league else ""
+    print(f"Warmed up in {time.perf_counter() - start:.2f}s{restored}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the league analysis app with a warm start")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2718)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    warm_up()
+    app = marimo.create_asgi_app().with_app(path="", root=str(NOTEBOOK)).build()
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
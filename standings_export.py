@@ -0,0 +1,156 @@
+import argparse
+import glob
+import json
+import shutil
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Mapping
+
+import polars as pl
+
+from league_store import write_atomic
+
+# Standings export
+# Writes the notebook's computed tables (default selection: all players, courses
+# and layouts) as Parquet/Arrow/CSV for the website & chat bot, stamped with the
+# league's data version (league_store key, a hash of the uploaded files):
+#
+#   export/
+#   ├── manifest.json                       # version, previous version, files & row counts
+#   └── <version>/
+#       ├── <table>.parquet|arrow|csv       # full table
+#       └── delta/<table>.<format>          # rows changed since <previous version>
+#
+# A delta has the changed/new rows (`Change` = "upsert") plus the key of every
+# row that disappeared (`Change` = "delete"). A consumer that has the previous
+# version applies the delta; anyone else just fetches the full table.
+#
+# Each version's files are written into its own directory and manifest.json is
+# replaced (atomically) last, so an export that fails part way leaves the last
+# manifest pointing at a complete set of files. The previous version's directory
+# is kept for consumers still reading the last manifest; older ones are removed.
+#
+# Usage:
+#   uv run python standings_export.py "Data/UDisc/*.csv" -o export --format parquet csv
+
+# Exported tables and the columns identifying a row in each
+TABLE_KEYS = {
+    "player_stats": ["PlayerName"],
+    "hole_difficulty": ["CourseName", "LayoutName", "Hole#"],
+    "player_hole_performance": ["PlayerName", "CourseName", "LayoutName", "Hole#"],
+    "player_extremes": ["PlayerName", "CourseName", "LayoutName", "Extreme", "Rank", "Hole#"],
+    "daily_avg": ["Date"],
+}
+
+WRITERS = {
+    "parquet": pl.DataFrame.write_parquet,
+    "arrow": pl.DataFrame.write_ipc,
+    "csv": pl.DataFrame.write_csv,
+}
+
+# The full Arrow copy is always written, it's what the next export diffs against
+BASELINE_FORMAT = "arrow"
+
+
+def table_delta(new: pl.DataFrame, old: pl.DataFrame, key: list[str]) -> pl.DataFrame:
+    # Rows of `new` that aren't identical in `old`, plus the keys of rows dropped since `old`
+    upserts = new.join(old, on=new.columns, how="anti", nulls_equal=True)
+    deletes = old.select(key).join(new.select(key), on=key, how="anti", nulls_equal=True)
+    return pl.concat(
+        [
+            upserts.with_columns(Change=pl.lit("upsert")),
+            deletes.with_columns(Change=pl.lit("delete")),
+        ],
+        how="diagonal",
+    )
+
+
+def export_tables(
+    tables: Mapping[str, pl.DataFrame],
+    version: str,
+    out_dir: str | Path,
+    formats: list[str] = ("parquet", "arrow", "csv"),
+) -> dict:
+    # Write full tables + deltas against the last export in `out_dir`; returns the manifest
+    out_dir = Path(out_dir)
+    formats = list(dict.fromkeys([*formats, BASELINE_FORMAT]))
+    manifest_path = out_dir / "manifest.json"
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+    if previous and previous["version"] == version:
+        # Re-exporting the same data keeps the delta to the version before it
+        previous_version = previous["previous_version"]
+    else:
+        previous_version = previous["version"] if previous else None
+
+    version_dir = out_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+    entries = {}
+    for name, key in TABLE_KEYS.items():
+        df = tables[name]
+        entry = {
+            "key": key,
+            "rows": df.height,
+            "files": {fmt: f"{version}/{name}.{fmt}" for fmt in formats},
+        }
+        baseline = out_dir / previous_version / f"{name}.{BASELINE_FORMAT}" if previous_version else None
+        if baseline and baseline.exists():
+            delta = table_delta(df, pl.read_ipc(baseline), key)
+            (version_dir / "delta").mkdir(exist_ok=True)
+            for fmt in formats:
+                write_atomic(version_dir / "delta" / f"{name}.{fmt}", partial(WRITERS[fmt], delta))
+            entry["delta"] = {
+                "upserts": delta.filter(pl.col("Change") == "upsert").height,
+                "deletes": delta.filter(pl.col("Change") == "delete").height,
+                "files": {fmt: f"{version}/delta/{name}.{fmt}" for fmt in formats},
+            }
+        for fmt in formats:
+            write_atomic(version_dir / f"{name}.{fmt}", partial(WRITERS[fmt], df))
+        entries[name] = entry
+
+    manifest = {
+        "version": version,
+        "previous_version": previous_version,
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables": entries,
+    }
+    write_atomic(manifest_path, lambda tmp: tmp.write_text(json.dumps(manifest, indent=2)))
+
+    # Only now that nothing points at them, drop versions older than the previous one
+    if previous:
+        for stale in {previous["version"], previous["previous_version"]} - {version, previous_version, None}:
+            shutil.rmtree(out_dir / stale, ignore_errors=True)
+    return manifest
+
+
+def export_league(paths: list[str], out_dir: str | Path, formats: list[str] = ("parquet", "arrow", "csv")) -> dict:
+    # Run the notebook headless (same as the static export) and export its tables
+    from static_export import run_notebook
+
+    defs = run_notebook(paths)
+    return export_tables({name: defs[name] for name in TABLE_KEYS}, defs["league"].key, out_dir, formats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export computed league tables with incremental deltas")
+    parser.add_argument("csv", nargs="+", help="UDisc CSV export file(s) or glob pattern(s)")
+    parser.add_argument("-o", "--out", default="export", help="Output directory (default: export)")
+    parser.add_argument(
+        "--format", nargs="+", choices=list(WRITERS), default=list(WRITERS),
+        help="File format(s) to write (default: all; arrow is always written)",
+    )
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.csv for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("No CSV files matched")
+    manifest = export_league(paths, args.out, args.format)
+    print(f"Exported version {manifest['version']} to {args.out}/")
+    for name, entry in manifest["tables"].items():
+        delta = entry.get("delta")
+        changes = f", {delta['upserts']} upserted / {delta['deletes']} deleted" if delta else ""
+        print(f"  {name}: {entry['rows']} rows{changes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import glob
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Mapping, NamedTuple
+
+import polars as pl
+
+# Static dashboard export
+# Runs the notebook once, headless, for the default selection (all players,
+# courses and layouts) and writes a static bundle that needs no Python kernel:
+#
+#   dist/
+#   ├── index.html            # vega-embed page with a client-side player filter
+#   ├── manifest.json         # chart specs, table names & player slices
+#   ├── data/<table>.arrow    # Arrow IPC copy of every precomputed table
+#   ├── data/<table>.json     # ... and a row-oriented JSON copy for the browser
+#   └── players/<player>.json # per-player slices of every table
+#
+# Usage:
+#   uv run python static_export.py "Data/UDisc/*.csv" -o dist
+#   python -m http.server -d dist   # any static file host works
+
+# Charts defined by the notebook that go in the bundle (name -> tab)
+CHARTS = {
+    "avg_score_bars": "League Ranks: Score & Attendance",
+    "player_hole_outcomes_plot": "League Ranks: Score & Attendance",
+    "attend_chart": "League Ranks: Score & Attendance",
+    "line_chart": "Performance over Time",
+    "relative_chart": "Performance over Time",
+    "hole_outcomes_plot": "Hole-by-Hole Analysis",
+    "hole_chart": "Hole-by-Hole Analysis",
+    "player_heatmap": "Hole-by-Hole Analysis",
+    "sg_heatmap": "Strokes Gained",
+    "sg_round_chart": "Strokes Gained",
+}
+
+# Tables defined by the notebook that go in the bundle
+TABLES = [
+    "player_stats",
+    "player_comparisons",
+    "daily_avg",
+    "hole_difficulty",
+    "player_hole_performance",
+    "player_extremes",
+    "sg_summary",
+    "sg_by_round",
+    "standings_now",
+    "standings_sim",
+    "rule_comparison",
+]
+
+
+class UploadedFile(NamedTuple):
+    name: str
+    contents: bytes
+
+
+class UploadedFiles(NamedTuple):
+    # Stands in for the notebook's mo.ui.file element
+    value: list[UploadedFile]
+
+
+def run_notebook(paths: list[str]) -> Mapping:
+    # Import here so that marimo only loads when actually exporting
+    from dg_analysis_nb import app
+
+    files = [UploadedFile(Path(p).name, Path(p).read_bytes()) for p in paths]
+    _, defs = app.run(defs={"csv_file": UploadedFiles(files)})
+    return defs
+
+
+def player_slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "player"
+
+
+def player_slugs(players: list[str]) -> dict[str, str]:
+    # Names that slug the same (e.g. "A.B" & "A B") get a short hash of the name appended,
+    # so each player keeps their own players/<slug>.json (and the same slug between exports)
+    slugs = {p: player_slug(p) for p in players}
+    taken = Counter(slugs.values())
+    return {
+        p: slug if taken[slug] == 1 else f"{slug}-{hashlib.sha1(p.encode()).hexdigest()[:8]}"
+        for p, slug in slugs.items()
+    }
+
+
+def write_table(df: pl.DataFrame, data_dir: Path, name: str) -> None:
+    df.write_ipc(data_dir / f"{name}.arrow")
+    df.write_json(data_dir / f"{name}.json")
+
+
+def export_bundle(paths: list[str], out_dir: str | Path) -> Path:
+    out_dir = Path(out_dir)
+    data_dir = out_dir / "data"
+    players_dir = out_dir / "players"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    players_dir.mkdir(parents=True, exist_ok=True)
+
+    defs = run_notebook(paths)
+
+    tables = {name: defs[name] for name in TABLES}
+    # Round-level data for the default selection (already without the wide hole columns)
+    tables["df_with_stats"] = defs["df_with_stats"]
+    for name, df in tables.items():
+        write_table(df, data_dir, name)
+
+    # Per-player slices of every table that has a PlayerName column
+    players = sorted(defs["df_long"]["PlayerName"].unique().to_list())
+    slugs = player_slugs(players)
+    for player in players:
+        player_slice = {
+            name: df.filter(pl.col("PlayerName") == player).to_dicts()
+            for name, df in tables.items()
+            if "PlayerName" in df.columns
+        }
+        (players_dir / f"{slugs[player]}.json").write_text(
+            json.dumps(player_slice, default=str)
+        )
+
+    manifest = {
+        "charts": [
+            {"name": name, "tab": tab, "spec": defs[name].to_dict()}
+            for name, tab in CHARTS.items()
+        ],
+        "tables": list(tables),
+        "players": [{"name": p, "slug": slugs[p]} for p in players],
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, default=str))
+    (out_dir / "index.html").write_text(INDEX_HTML)
+    return out_dir
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>Disc Golf League Analysis</title>
+  <script src="https://cdn.jsdelivr.net/npm/vega@6"></script>
+  <script src="https://cdn.jsdelivr.net/npm/vega-lite@6"></script>
+  <script src="https://cdn.jsdelivr.net/npm/vega-embed@7"></script>
+  <style>
+    body { font-family: sans-serif; margin: 2em; color: #2c3e50; }
+    table { border-collapse: collapse; margin: 1em 0; font-size: 12px; }
+    th, td { border: 1px solid #e0e0e0; padding: 2px 8px; text-align: right; }
+    h2 { margin-top: 2em; }
+  </style>
+</head>
+<body>
+  <h1>🥏 Disc Golf League Analysis 📊</h1>
+  <label>Player: <select id="player"><option value="">All players</option></select></label>
+  <div id="charts"></div>
+  <div id="tables"></div>
+<script>
+const sliceCache = {};
+
+// Keep only the selected player's rows in every dataset that has a PlayerName
+function filterSpec(spec, player) {
+  const s = structuredClone(spec);
+  if (player && s.datasets) {
+    for (const k in s.datasets) {
+      s.datasets[k] = s.datasets[k].filter(r => !("PlayerName" in r) || r.PlayerName === player);
+    }
+  }
+  return s;
+}
+
+// Names & values come from the uploaded CSVs, so they only ever go in as text, never as markup
+function el(tag, text) {
+  const e = document.createElement(tag);
+  if (text !== undefined) e.textContent = text;
+  return e;
+}
+
+function renderTable(parent, name, rows) {
+  if (!rows.length) return;
+  const cols = Object.keys(rows[0]);
+  const table = el("table");
+  const head = table.insertRow();
+  for (const c of cols) head.appendChild(el("th", c));
+  for (const r of rows) {
+    const tr = table.insertRow();
+    for (const c of cols) tr.appendChild(el("td", String(r[c] ?? "")));
+  }
+  parent.append(el("h3", name), table);
+}
+
+async function tablesFor(manifest, slug) {
+  if (!slug) {
+    const entries = await Promise.all(manifest.tables.map(async t => [t, await (await fetch(`data/${t}.json`)).json()]));
+    return Object.fromEntries(entries);
+  }
+  sliceCache[slug] ??= await (await fetch(`players/${slug}.json`)).json();
+  return sliceCache[slug];
+}
+
+async function render(manifest) {
+  const select = document.getElementById("player");
+  const player = select.value;
+  const slug = select.selectedOptions[0].dataset.slug;
+
+  const charts = document.getElementById("charts");
+  charts.replaceChildren();
+  let tab = null;
+  for (const chart of manifest.charts) {
+    if (chart.tab !== tab) {
+      tab = chart.tab;
+      charts.appendChild(el("h2", tab));
+    }
+    const div = el("div");
+    charts.appendChild(div);
+    vegaEmbed(div, filterSpec(chart.spec, player), { actions: false });
+  }
+
+  const tables = await tablesFor(manifest, slug);
+  const container = document.getElementById("tables");
+  container.replaceChildren(el("h2", "Tables"));
+  for (const [name, rows] of Object.entries(tables)) renderTable(container, name, rows);
+}
+
+fetch("manifest.json").then(r => r.json()).then(manifest => {
+  const select = document.getElementById("player");
+  for (const p of manifest.players) {
+    const option = el("option", p.name);
+    option.value = p.name;
+    option.dataset.slug = p.slug;
+    select.appendChild(option);
+  }
+  select.addEventListener("change", () => render(manifest));
+  render(manifest);
+});
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a static dashboard bundle from UDisc CSV exports")
+    parser.add_argument("csv", nargs="+", help="UDisc CSV export file(s) or glob pattern(s)")
+    parser.add_argument("-o", "--out", default="dist", help="Output directory (default: dist)")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.csv for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("No CSV files matched")
+    out_dir = export_bundle(paths, args.out)
+    print(f"Exported {len(paths)} file(s) to {out_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import polars as pl
+
+import league_store
+
+# Strokes gained
+# A player's strokes gained on a hole is how many fewer throws they took than
+# the field expectation for that hole on that night (same course, layout & date),
+# so it accounts for conditions as well as hole difficulty. Positive = gained.
+# The field expectation leaves the player out, so small fields aren't biased
+# towards each player's own score; a hole with no one else on it has no value.
+
+FIELD_COLS = ["CourseName", "LayoutName", "Date", "Hole#"]
+ROUND_COLS = league_store.ROUND_COLS
+
+
+def strokes_gained_by_hole(hole_analysis: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+    # One row per player, round & hole; field sums/counts are window aggregates over FIELD_COLS
+    field_sum = pl.col("ShotsThrown").sum().over(FIELD_COLS)
+    field_size = pl.col("ShotsThrown").count().over(FIELD_COLS)
+    return (
+        hole_analysis.lazy()
+        .filter(pl.col("ShotsThrown").is_not_null())
+        .with_columns(
+            field_size.alias("Field_Size"),
+            ((field_sum - pl.col("ShotsThrown")) / (field_size - 1)).alias("Field_Avg"),
+        )
+        .with_columns(
+            pl.when(pl.col("Field_Size") > 1)
+            .then(pl.col("Field_Avg"))
+            .alias("Field_Avg"),
+        )
+        .with_columns(
+            (pl.col("Field_Avg") - pl.col("ShotsThrown")).alias("Strokes_Gained"),
+        )
+        .select(*ROUND_COLS, "Hole#", "Par", "ShotsThrown", "Field_Size", "Field_Avg", "Strokes_Gained")
+        .collect()
+    )
+
+
+def strokes_gained_by_round(sg_by_hole: pl.DataFrame) -> pl.DataFrame:
+    # Total strokes gained over each player's round
+    return (
+        sg_by_hole
+        .group_by(ROUND_COLS)
+        .agg(
+            pl.sum("Strokes_Gained").round(2).alias("Strokes_Gained"),
+            pl.col("Strokes_Gained").count().alias("Holes_Compared"),
+        )
+        .sort("Date", "PlayerName")
+    )
+
+
+def player_strokes_gained(sg_by_hole: pl.DataFrame) -> pl.DataFrame:
+    # Average strokes gained per round on each hole, for each player
+    return (
+        sg_by_hole
+        .group_by(["PlayerName", "CourseName", "LayoutName", "Hole#"])
+        .agg(
+            pl.mean("Strokes_Gained").round(2).alias("Avg_Strokes_Gained"),
+            pl.sum("Strokes_Gained").round(2).alias("Total_Strokes_Gained"),
+            pl.col("Strokes_Gained").count().alias("Rounds_Played"),
+        )
+        .sort("PlayerName", "CourseName", "LayoutName", "Hole#")
+    )
+
+
+def league_strokes_gained(league: league_store.LeagueData) -> dict[str, pl.DataFrame]:
+    # All strokes gained tables for a league, computed once per data version and shared
+    def build(league: league_store.LeagueData) -> dict[str, pl.DataFrame]:
+        by_hole = strokes_gained_by_hole(league.hole_analysis)
+        return {
+            "by_hole": by_hole,
+            "by_round": strokes_gained_by_round(by_hole),
+            "by_player_hole": player_strokes_gained(by_hole),
+        }
+
+    return league_store.derived(league, "strokes_gained", build)
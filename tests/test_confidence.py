@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import polars as pl
+
+import confidence
+
+
+class HolmTest(unittest.TestCase):
+    def test_step_down_adjustment(self):
+        np.testing.assert_allclose(confidence.holm(np.array([0.01, 0.04, 0.03, 0.005])), [0.03, 0.06, 0.06, 0.02])
+
+    def test_capped_at_one(self):
+        np.testing.assert_allclose(confidence.holm(np.array([0.5, 0.9])), [1.0, 1.0])
+
+    def test_no_tests(self):
+        self.assertEqual(len(confidence.holm(np.array([]))), 0)
+
+
+class BootstrapMeansTest(unittest.TestCase):
+    def check(self, values, counts):
+        boot = confidence.bootstrap_means(values, counts, n_resamples=20_000)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        groups = [values[s:s + n] for s, n in zip(starts, counts)]
+        np.testing.assert_allclose(boot.mean(axis=0), [g.mean() for g in groups], atol=0.02)
+        np.testing.assert_allclose(boot.std(axis=0), [g.std() / np.sqrt(len(g)) for g in groups], rtol=0.05)
+
+    def test_few_distinct_values(self):
+        # Hole scores: resampled as multinomial counts of each distinct value
+        rng = np.random.default_rng(0)
+        self.check(rng.integers(-2, 4, 555).astype(float), np.array([5, 50, 500]))
+
+    def test_mostly_distinct_values(self):
+        # Resampled by drawing row indices
+        self.check(np.random.default_rng(0).normal(size=30), np.array([10, 20]))
+
+    def test_single_value_group_has_no_spread(self):
+        boot = confidence.bootstrap_means(np.array([2.0, 2.0, 2.0, 1.0, 3.0]), np.array([3, 2]), n_resamples=100)
+        self.assertTrue((boot[:, 0] == 2.0).all())
+
+
+class PairwiseCompareTest(unittest.TestCase):
+    def setUp(self):
+        self.df = pl.DataFrame({
+            "PlayerName": ["Ann"] * 6 + ["Bob"] * 6 + ["Cid"] * 6,
+            "Score": [-4, -5, -3, -4, -5, -4, 6, 5, 7, 6, 5, 6, 0, 1, -1, 0, 1, 6],
+        })
+
+    def test_one_row_per_pair(self):
+        pairs = confidence.pairwise_compare(self.df)
+        self.assertEqual(
+            sorted(pairs.select("PlayerName_A", "PlayerName_B").rows()),
+            [("Ann", "Bob"), ("Ann", "Cid"), ("Bob", "Cid")],
+        )
+
+    def test_significance_uses_adjusted_p_value(self):
+        pairs = confidence.pairwise_compare(self.df)
+        self.assertTrue((pairs["P_Adjusted"] >= pairs["P_Value"]).all())
+        self.assertEqual(pairs["Significant"].to_list(), (pairs["P_Adjusted"] < 0.05).to_list())
+
+    def test_select_pairs_adjusts_for_fewer_tests(self):
+        pairs = confidence.pairwise_compare(self.df)
+        selected = confidence.select_pairs(pairs, ["Ann", "Cid"])
+        self.assertEqual(selected.select("PlayerName_A", "PlayerName_B").rows(), [("Ann", "Cid")])
+        self.assertEqual(selected["P_Adjusted"].to_list(), selected["P_Value"].to_list())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import polars as pl
+
+import hole_stats
+
+
+def performance(rows: list[tuple[str, int, float, int]]) -> pl.DataFrame:
+    # (player, hole, avg score vs par, rounds played) -> player_hole_performance rows
+    return pl.DataFrame(
+        rows, schema=["PlayerName", "Hole#", "Avg_Score_vs_Par", "Rounds_Played"], orient="row"
+    )
+
+
+class RankPlayerHolesTest(unittest.TestCase):
+    def extremes(self, df, **kwargs) -> list[tuple]:
+        return hole_stats.rank_player_holes(df, **kwargs).select("PlayerName", "Extreme", "Rank", "Hole#").rows()
+
+    def test_best_and_nemesis_per_player(self):
+        df = performance([
+            ("Ann", 1, -0.5, 3), ("Ann", 2, 0.0, 3), ("Ann", 3, 1.0, 3),
+            ("Bob", 1, 2.0, 3), ("Bob", 2, -1.0, 3),
+        ])
+        self.assertEqual(self.extremes(df), [
+            ("Ann", "Best", 1, 1), ("Ann", "Nemesis", 1, 3),
+            ("Bob", "Best", 1, 2), ("Bob", "Nemesis", 1, 1),
+        ])
+
+    def test_ties_share_a_rank(self):
+        df = performance([("Ann", 1, -0.5, 3), ("Ann", 2, -0.5, 3), ("Ann", 3, 0.0, 3), ("Ann", 4, 1.0, 3)])
+        self.assertEqual(self.extremes(df, k=2), [
+            ("Ann", "Best", 1, 1), ("Ann", "Best", 1, 2), ("Ann", "Best", 2, 3),
+            ("Ann", "Nemesis", 1, 4), ("Ann", "Nemesis", 2, 3),
+        ])
+
+    def test_min_rounds_skips_rarely_played_holes(self):
+        df = performance([("Ann", 1, -2.0, 1), ("Ann", 2, 0.0, 4), ("Ann", 3, 1.0, 4)])
+        self.assertEqual(self.extremes(df, min_rounds=2), [("Ann", "Best", 1, 2), ("Ann", "Nemesis", 1, 3)])
+
+    def test_player_without_enough_rounds_is_left_out(self):
+        df = performance([("Ann", 1, 0.0, 4), ("Bob", 1, 1.0, 1)])
+        self.assertEqual({row[0] for row in self.extremes(df, min_rounds=2)}, {"Ann"})
+
+    def test_ranked_per_layout(self):
+        df = performance([("Ann", 1, -1.0, 2), ("Ann", 1, 1.0, 2)]).with_columns(
+            LayoutName=pl.Series(["Main", "Short"])
+        )
+        ranked = hole_stats.rank_player_holes(df, by=["PlayerName", "LayoutName"])
+        self.assertEqual(ranked.filter(pl.col("Extreme") == "Best")["LayoutName"].to_list(), ["Main", "Short"])
+
+
+class PlayerHolePerformanceTest(unittest.TestCase):
+    def test_same_hole_number_on_two_layouts_is_kept_apart(self):
+        hole_analysis = pl.DataFrame({
+            "PlayerName": ["Ann"] * 3,
+            "CourseName": ["Park"] * 3,
+            "LayoutName": ["Main", "Main", "Short"],
+            "Hole#": [5, 5, 5],
+            "Score_vs_Par": [1, -1, 2],
+        })
+        php = hole_stats.player_hole_performance(hole_analysis)
+        self.assertEqual(php.select("LayoutName", "Avg_Score_vs_Par", "Rounds_Played").rows(), [
+            ("Main", 0.0, 2), ("Short", 2.0, 1),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
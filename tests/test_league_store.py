@@ -0,0 +1,44 @@
+import unittest
+
+import polars as pl
+
+import league_store
+
+
+def league(key: str) -> league_store.LeagueData:
+    empty = pl.DataFrame()
+    return league_store.LeagueData(key, empty, empty, empty, empty, empty)
+
+
+class DerivedTest(unittest.TestCase):
+    def setUp(self):
+        self.builds = 0
+
+    def tearDown(self):
+        with league_store._lock:
+            for key in ["00000000000000aa", "00000000000000bb"]:
+                league_store._store.pop(key, None)
+            for derived_key in [k for k in league_store._derived if k[0].startswith("00000000000000")]:
+                del league_store._derived[derived_key]
+
+    def build(self, league):
+        self.builds += 1
+        return self.builds
+
+    def test_built_once_per_league(self):
+        stored = league("00000000000000aa")
+        with league_store._lock:
+            league_store._add(stored)
+        self.assertEqual(league_store.derived(stored, "t", self.build), 1)
+        self.assertEqual(league_store.derived(stored, "t", self.build), 1)
+        self.assertEqual(self.builds, 1)
+
+    def test_league_not_in_store_is_not_cached(self):
+        unstored = league("00000000000000bb")
+        self.assertEqual(league_store.derived(unstored, "t", self.build), 1)
+        self.assertEqual(league_store.derived(unstored, "t", self.build), 2)
+        self.assertNotIn(("00000000000000bb", "t"), league_store._derived)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from datetime import date
+
+import numpy as np
+import polars as pl
+
+import season_sim
+
+
+def rounds(scores: dict[str, list[int | None]]) -> pl.DataFrame:
+    # One row per player & league night; None = didn't play that night
+    return pl.DataFrame(
+        [
+            {"PlayerName": player, "Date": date(2025, 11, night + 1), "Score": score}
+            for player, player_scores in scores.items()
+            for night, score in enumerate(player_scores)
+            if score is not None
+        ]
+    )
+
+
+class RankTest(unittest.TestCase):
+    def rank(self, totals, counted, attendance, seed=0):
+        return season_sim._rank(
+            np.array([totals], dtype=float),
+            np.array([counted]),
+            np.array([attendance]),
+            np.random.default_rng(seed),
+        )[0].tolist()
+
+    def test_lowest_total_first(self):
+        self.assertEqual(self.rank([3, 1, 2], [1, 1, 1], [1, 1, 1]), [2, 0, 1])
+
+    def test_more_rounds_counted_beats_lower_total(self):
+        self.assertEqual(self.rank([10, -5], [2, 1], [2, 1]), [0, 1])
+
+    def test_attendance_breaks_a_tie(self):
+        self.assertEqual(self.rank([2, 2, 2], [1, 1, 1], [3, 5, 4]), [2, 0, 1])
+
+    def test_exact_tie_is_a_coin_toss(self):
+        firsts = {self.rank([0, 0], [1, 1], [1, 1], seed).index(0) for seed in range(20)}
+        self.assertEqual(firsts, {0, 1})
+
+    def test_places_per_trial(self):
+        places = season_sim._rank(
+            np.array([[1.0, 2.0], [2.0, 1.0]]),
+            np.ones((2, 2)),
+            np.ones((2, 2)),
+            np.random.default_rng(0),
+        )
+        self.assertEqual(places.tolist(), [[0, 1], [1, 0]])
+
+
+class CurrentStandingsTest(unittest.TestCase):
+    def setUp(self):
+        self.df = rounds({
+            "Ann": [4, -2, 6],
+            "Bob": [-1, None, 0],
+            "Cid": [None, -2, None],
+        })
+
+    def test_best_round(self):
+        standings = season_sim.current_standings(self.df, best_of=1)
+        self.assertEqual(standings["PlayerName"].to_list(), ["Ann", "Cid", "Bob"])
+        self.assertEqual(standings["Season_Score"].to_list(), [-2, -2, -1])
+        self.assertEqual(standings["Place"].to_list(), [1, 2, 3])
+        self.assertEqual(standings["Attendance"].to_list(), [3, 1, 2])
+
+    def test_sum_of_best_rounds(self):
+        standings = season_sim.current_standings(self.df, best_of=2)
+        # Cid has too few rounds to count two, so ranks last despite the lowest sum
+        self.assertEqual(standings["PlayerName"].to_list(), ["Bob", "Ann", "Cid"])
+        self.assertEqual(standings["Season_Score"].to_list(), [-1, 2, -2])
+        self.assertEqual(standings["Rounds_Counted"].to_list(), [2, 2, 1])
+
+
+class RuleBestOfTest(unittest.TestCase):
+    def test_drop_worst_maps_to_rounds_counted(self):
+        self.assertEqual(
+            season_sim.rule_best_of(8, [0, 1, 2]),
+            {"Best round": 1, "Drop worst 0": 8, "Drop worst 1": 7, "Drop worst 2": 6},
+        )
+
+    def test_rules_counting_one_round_or_less_are_left_out(self):
+        # Dropping all but one round is the best round rule; dropping more counts nothing
+        self.assertEqual(season_sim.rule_best_of(3, [1, 2, 3]), {"Best round": 1, "Drop worst 1": 2})
+
+
+class SimulateStandingsTest(unittest.TestCase):
+    def setUp(self):
+        self.df = rounds({
+            "Ann": [4, -2, 6],
+            "Bob": [-1, 3, 0],
+            "Cid": [None, -2, 1],
+        })
+
+    def test_finished_season_matches_current_standings(self):
+        sim = season_sim.simulate_standings(self.df, season_rounds=3, n_trials=1000)
+        winner = season_sim.current_standings(self.df)["PlayerName"][0]
+        self.assertEqual(sim.filter(pl.col("Win_Prob") == 1.0)["PlayerName"].to_list(), [winner])
+
+    def test_place_probabilities_sum_to_one(self):
+        sim = season_sim.simulate_standings(self.df, season_rounds=8, n_trials=2000)
+        places = sim.select(pl.col("^Place_\\d+$")).to_numpy()
+        np.testing.assert_allclose(places.sum(axis=0), 1.0)
+        np.testing.assert_allclose(places.sum(axis=1), 1.0)
+
+    def test_process_pool_matches_in_process(self):
+        n_trials = 2 * season_sim.MIN_TRIALS_PER_WORKER
+        pooled = season_sim.simulate_standings(self.df, n_trials=n_trials, workers=2)
+        season = season_sim._season_arrays(self.df, season_sim.SEASON_ROUNDS)
+        seeds = np.random.SeedSequence(season_sim.SEED).spawn(2)
+        place_counts = sum(
+            season_sim._simulate_batch(season, 1, season_sim.JITTER, n_trials // 2, seed) for seed in seeds
+        )
+        expected = dict(zip(season["names"], place_counts[:, 0] / n_trials))
+        self.assertEqual(dict(pooled.select("PlayerName", "Win_Prob").iter_rows()), expected)
+
+    def test_no_rounds(self):
+        self.assertTrue(season_sim.simulate_standings(self.df.head(0)).is_empty())
+
+
+class PoolTest(unittest.TestCase):
+    def setUp(self):
+        season_sim._reset_pool()
+        self.addCleanup(season_sim._reset_pool)
+
+    def test_sized_to_the_workers_asked_for(self):
+        pool = season_sim._get_pool(2)
+        self.addCleanup(pool.shutdown)
+        self.assertEqual(pool._max_workers, 2)
+        # Fewer workers reuse it, more replace it with a bigger pool
+        self.assertIs(season_sim._get_pool(1), pool)
+        bigger = season_sim._get_pool(3)
+        self.addCleanup(bigger.shutdown)
+        self.assertEqual(bigger._max_workers, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import polars as pl
+
+import standings_export
+
+
+def tables(scores: dict[str, float]) -> dict[str, pl.DataFrame]:
+    # Every exported table, keyed by its key columns, with one value column: player -> value
+    players = list(scores)
+    columns = {
+        "PlayerName": players,
+        "CourseName": "Park",
+        "LayoutName": "Main",
+        "Hole#": 1,
+        "Extreme": "Best",
+        "Rank": 1,
+        "Date": [f"2025-11-{i:02}" for i in range(1, len(players) + 1)],
+        "Value": list(scores.values()),
+    }
+    df = pl.DataFrame(columns)
+    return {name: df.select(*key, "Value") for name, key in standings_export.TABLE_KEYS.items()}
+
+
+class TableDeltaTest(unittest.TestCase):
+    def test_upserts_and_deletes(self):
+        old = pl.DataFrame({"PlayerName": ["Ann", "Bob", "Cid"], "Value": [1.0, 2.0, 3.0]})
+        new = pl.DataFrame({"PlayerName": ["Ann", "Bob", "Dee"], "Value": [1.0, 2.5, 4.0]})
+        delta = standings_export.table_delta(new, old, ["PlayerName"])
+        self.assertEqual(delta.rows(), [
+            ("Bob", 2.5, "upsert"),
+            ("Dee", 4.0, "upsert"),
+            ("Cid", None, "delete"),
+        ])
+
+    def test_no_changes(self):
+        df = pl.DataFrame({"PlayerName": ["Ann"], "Value": [None]}, schema_overrides={"Value": pl.Float64})
+        self.assertTrue(standings_export.table_delta(df, df, ["PlayerName"]).is_empty())
+
+
+class ExportTablesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = Path(tmp.name)
+
+    def export(self, scores: dict[str, float], version: str, formats=("arrow",)) -> dict:
+        return standings_export.export_tables(tables(scores), version, self.out, formats)
+
+    def manifest(self) -> dict:
+        return json.loads((self.out / "manifest.json").read_text())
+
+    def test_first_export_has_no_delta(self):
+        manifest = self.export({"Ann": 1.0}, "v1", formats=["csv"])
+        self.assertIsNone(manifest["previous_version"])
+        entry = manifest["tables"]["player_stats"]
+        self.assertNotIn("delta", entry)
+        self.assertEqual(entry["files"], {"csv": "v1/player_stats.csv", "arrow": "v1/player_stats.arrow"})
+        self.assertEqual(pl.read_csv(self.out / entry["files"]["csv"])["PlayerName"].to_list(), ["Ann"])
+        self.assertEqual(self.manifest(), manifest)
+
+    def test_delta_against_previous_version(self):
+        self.export({"Ann": 1.0, "Bob": 2.0, "Cid": 3.0}, "v1")
+        manifest = self.export({"Ann": 1.0, "Bob": 2.5, "Dee": 4.0}, "v2")
+        self.assertEqual(manifest["previous_version"], "v1")
+        delta = manifest["tables"]["player_stats"]["delta"]
+        self.assertEqual((delta["upserts"], delta["deletes"]), (2, 1))
+        rows = pl.read_ipc(self.out / delta["files"]["arrow"]).select("PlayerName", "Change").rows()
+        self.assertEqual(rows, [("Bob", "upsert"), ("Dee", "upsert"), ("Cid", "delete")])
+
+    def test_same_version_re_export_keeps_its_delta(self):
+        self.export({"Ann": 1.0, "Bob": 2.0}, "v1")
+        first = self.export({"Ann": 1.5, "Bob": 2.0}, "v2")
+        again = self.export({"Ann": 1.5, "Bob": 2.0}, "v2")
+        self.assertEqual(again["previous_version"], "v1")
+        self.assertEqual(again["tables"], first["tables"])
+        self.assertEqual(again["tables"]["player_stats"]["delta"]["upserts"], 1)
+
+    def test_only_current_and_previous_versions_are_kept(self):
+        for version, score in [("v1", 1.0), ("v2", 2.0), ("v3", 3.0)]:
+            self.export({"Ann": score}, version)
+        self.assertEqual(sorted(p.name for p in self.out.iterdir() if p.is_dir()), ["v2", "v3"])
+
+    def test_failed_export_leaves_the_last_one_intact(self):
+        self.export({"Ann": 1.0}, "v1")
+        before = self.manifest()
+
+        def fail(df, path):
+            raise OSError("disk full")
+
+        # Fails after some of v2's files are already written
+        with mock.patch.dict(standings_export.WRITERS, {"csv": fail}):
+            with self.assertRaises(OSError):
+                self.export({"Ann": 2.0}, "v2", formats=["arrow", "csv"])
+        self.assertEqual(self.manifest(), before)
+        self.assertEqual(pl.read_ipc(self.out / "v1" / "player_stats.arrow")["Value"].to_list(), [1.0])
+
+        # The next export still diffs against the last complete one
+        manifest = self.export({"Ann": 2.0}, "v2")
+        self.assertEqual(manifest["previous_version"], "v1")
+        self.assertEqual(manifest["tables"]["player_stats"]["delta"]["upserts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
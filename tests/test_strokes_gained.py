@@ -0,0 +1,52 @@
+import unittest
+from datetime import date
+
+import polars as pl
+
+import strokes_gained
+
+
+def holes(shots: dict[str, int | None], hole: int = 1, day: int = 1) -> pl.DataFrame:
+    # One hole of one league night: player -> throws
+    return pl.DataFrame({
+        "PlayerName": list(shots),
+        "CourseName": "Park",
+        "LayoutName": "Main",
+        "Date": date(2025, 11, day),
+        "Hole#": hole,
+        "Par": 3,
+        "ShotsThrown": list(shots.values()),
+    }, schema_overrides={"ShotsThrown": pl.Int64})
+
+
+class StrokesGainedByHoleTest(unittest.TestCase):
+    def by_player(self, hole_analysis: pl.DataFrame) -> dict:
+        sg = strokes_gained.strokes_gained_by_hole(hole_analysis)
+        return dict(sg.select("PlayerName", "Strokes_Gained").iter_rows())
+
+    def test_field_average_leaves_the_player_out(self):
+        # Ann vs the average of Bob & Cid (4), not of all three (3.33)
+        sg = strokes_gained.strokes_gained_by_hole(holes({"Ann": 2, "Bob": 4, "Cid": 4}))
+        self.assertEqual(dict(sg.select("PlayerName", "Field_Avg").iter_rows()), {"Ann": 4.0, "Bob": 3.0, "Cid": 3.0})
+        self.assertEqual(dict(sg.select("PlayerName", "Strokes_Gained").iter_rows()), {"Ann": 2.0, "Bob": -1.0, "Cid": -1.0})
+
+    def test_two_player_field_is_zero_sum(self):
+        self.assertEqual(self.by_player(holes({"Ann": 3, "Bob": 5})), {"Ann": 2.0, "Bob": -2.0})
+
+    def test_alone_on_a_hole_has_no_value(self):
+        self.assertEqual(self.by_player(holes({"Ann": 3})), {"Ann": None})
+
+    def test_missing_scores_are_not_in_the_field(self):
+        self.assertEqual(self.by_player(holes({"Ann": 3, "Bob": 5, "Cid": None})), {"Ann": 2.0, "Bob": -2.0})
+
+    def test_field_is_per_night_and_hole(self):
+        sg = strokes_gained.strokes_gained_by_hole(pl.concat([
+            holes({"Ann": 3, "Bob": 5}),
+            holes({"Ann": 3, "Bob": 1}, hole=2),
+            holes({"Ann": 3, "Bob": 3}, day=2),
+        ]))
+        self.assertEqual(sg.filter(pl.col("PlayerName") == "Ann")["Strokes_Gained"].to_list(), [2.0, -2.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
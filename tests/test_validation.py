@@ -0,0 +1,110 @@
+import unittest
+from datetime import date
+
+import polars as pl
+
+import validation
+
+PAR = [3, 3, 4]
+
+
+def round_row(player: str, holes: list[int | None], **overrides) -> dict:
+    # A cleaned 3-hole round whose Total & Score (+/-) agree with its holes, unless overridden
+    played = [h for h in holes if h is not None]
+    row = {
+        "PlayerName": player,
+        "CourseName": "Park",
+        "LayoutName": "Main",
+        "Date": date(2025, 11, 1),
+        "Round Duration (min)": 90,
+        "Total": sum(played),
+        "Score": sum(played) - sum(PAR),
+        **{f"Hole{i}": h for i, h in enumerate(holes, 1)},
+    }
+    return row | overrides
+
+
+def check(*rows: dict) -> dict[str, str | None]:
+    # Player -> Issues, with the layout's par row first
+    par = round_row("Par", PAR, Score=None)
+    checked = validation.check_rounds(pl.DataFrame([par, *rows]))
+    return dict(checked.select("PlayerName", "Issues").iter_rows())
+
+
+class CheckRoundsTest(unittest.TestCase):
+    def test_valid_round(self):
+        self.assertEqual(check(round_row("Ann", [3, 2, 5])), {"Par": None, "Ann": None})
+
+    def test_missing_holes(self):
+        self.assertEqual(check(round_row("Ann", [3, None, 5]))["Ann"], "missing holes")
+
+    def test_total_mismatch(self):
+        self.assertEqual(check(round_row("Ann", [3, 2, 5], Total=11, Score=1))["Ann"], "Total doesn't match hole scores")
+
+    def test_score_mismatch(self):
+        self.assertEqual(check(round_row("Ann", [3, 2, 5], Score=2))["Ann"], "+/- doesn't match Total - par")
+
+    def test_impossible_hole_score(self):
+        self.assertEqual(check(round_row("Ann", [3, 0, 5]))["Ann"], "impossible hole score (<1 or >15)")
+        self.assertEqual(check(round_row("Ann", [3, 16, 5]))["Ann"], "impossible hole score (<1 or >15)")
+
+    def test_negative_round_duration(self):
+        self.assertEqual(check(round_row("Ann", [3, 2, 5], **{"Round Duration (min)": -5}))["Ann"], "negative round duration")
+
+    def test_missing_round_date(self):
+        self.assertEqual(check(round_row("Ann", [3, 2, 5], Date=None))["Ann"], "missing round date")
+
+    def test_several_issues_are_all_listed(self):
+        issues = check(round_row("Ann", [3, 0, 5], Date=None, Total=99, Score=89))["Ann"]
+        self.assertEqual(issues.split("; "), [
+            "Total doesn't match hole scores",
+            "impossible hole score (<1 or >15)",
+            "missing round date",
+        ])
+
+    def test_par_row_is_never_flagged(self):
+        # The par row has no +/- and no RoundRating, but it's not a round
+        par = round_row("Par", PAR, Score=None, Date=None)
+        checked = validation.check_rounds(pl.DataFrame([par, round_row("Ann", [3, 2, 5])]))
+        self.assertEqual(checked["Issues"].to_list(), [None, None])
+
+    def test_hole_not_in_layout_isnt_missing(self):
+        # A layout whose par row has no value for a hole doesn't expect a score there
+        par = round_row("Par", [3, 3, None], Score=None)
+        checked = validation.check_rounds(pl.DataFrame([par, round_row("Ann", [3, 2, None], Score=-1)]))
+        self.assertEqual(checked["Issues"].to_list(), [None, None])
+
+    def test_par_is_per_layout(self):
+        short = {"LayoutName": "Short", "Total": 8, "Score": 0}
+        par_short = round_row("Par", [3, 3, 2], Score=None, **{"LayoutName": "Short"})
+        checked = validation.check_rounds(pl.DataFrame([
+            round_row("Par", PAR, Score=None), par_short,
+            round_row("Ann", [3, 3, 4]), round_row("Ann", [3, 3, 2], **short),
+        ]))
+        self.assertEqual(checked["Issues"].to_list(), [None] * 4)
+
+    def test_duplicate_round_flags_the_repeat_only(self):
+        ann = round_row("Ann", [3, 2, 5])
+        par = round_row("Par", PAR, Score=None)
+        checked = validation.check_rounds(pl.DataFrame([par, ann, ann, round_row("Bob", [3, 2, 5])]))
+        self.assertEqual(checked["Issues"].to_list(), [None, None, "duplicate round", None])
+
+    def test_duplicate_par_rows_arent_flagged(self):
+        # Every uploaded file repeats the par row
+        par = round_row("Par", PAR, Score=None)
+        checked = validation.check_rounds(pl.DataFrame([par, par, round_row("Ann", [3, 2, 5])]))
+        self.assertEqual(checked["Issues"].to_list(), [None, None, None])
+
+
+class SplitRoundsTest(unittest.TestCase):
+    def test_split(self):
+        par = round_row("Par", PAR, Score=None)
+        checked = validation.check_rounds(pl.DataFrame([par, round_row("Ann", [3, 2, 5]), round_row("Bob", [3, 0, 5])]))
+        valid, quarantined = validation.split_rounds(checked)
+        self.assertEqual(valid["PlayerName"].to_list(), ["Par", "Ann"])
+        self.assertNotIn("Issues", valid.columns)
+        self.assertEqual(quarantined.select("PlayerName", "Issues").rows(), [("Bob", "impossible hole score (<1 or >15)")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import polars as pl
+import polars.selectors as cs
+
+# Round validation
+# Every integrity check is a column expression over the wide hole matrix. They
+# all run in one lazy query (a join to each layout's par row, then the checks),
+# so polars evaluates them in a single pass over the rounds. The result is an
+# `Issues` column with the reasons a round failed, separated by "; " (null when
+# the round is fine).
+
+# Highest believable throws on a single hole
+MAX_HOLE_SCORE = 15
+
+LAYOUT_COLS = ["CourseName", "LayoutName"]
+
+
+def check_rounds(df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+    # Adds an `Issues` column to cleaned rounds (after Date/Round Duration & Score are derived)
+    lf = df.lazy()
+    columns = lf.collect_schema().names()
+    holes = lf.select(cs.starts_with("Hole")).collect_schema().names()
+    par_holes = [f"{h}_par" for h in holes]
+
+    # Each layout's par for every hole, from its "Par" row
+    par = (
+        lf.filter(pl.col("PlayerName") == "Par")
+        .select(*LAYOUT_COLS, *[pl.col(h).alias(p) for h, p in zip(holes, par_holes)])
+        .unique(LAYOUT_COLS, keep="last")
+    )
+
+    checks = {
+        # A hole is expected if the layout's par row has a value for it
+        "missing holes": pl.col("_missing_holes") > 0,
+        "Total doesn't match hole scores": pl.col("Total") != pl.col("_hole_sum"),
+        "+/- doesn't match Total - par": (
+            (pl.col("Score") != pl.col("Total") - pl.col("_par_total")) & (pl.col("_missing_holes") == 0)
+        ),
+        f"impossible hole score (<1 or >{MAX_HOLE_SCORE})": pl.any_horizontal(
+            (pl.col(holes) < 1) | (pl.col(holes) > MAX_HOLE_SCORE)
+        ),
+        "negative round duration": pl.col("Round Duration (min)") < 0,
+        "missing round date": pl.col("Date").is_null(),
+        "duplicate round": ~pl.struct(columns).is_first_distinct(),
+    }
+    is_player = pl.col("PlayerName") != "Par"
+    issues = pl.concat_str(
+        [pl.when(is_player & failed).then(pl.lit(reason)) for reason, failed in checks.items()],
+        separator="; ",
+        ignore_nulls=True,
+    )
+
+    return (
+        lf.join(par, on=LAYOUT_COLS, how="left", maintain_order="left")
+        .with_columns(
+            pl.sum_horizontal(
+                (pl.col(h).is_null() & pl.col(p).is_not_null()).cast(pl.UInt16) for h, p in zip(holes, par_holes)
+            ).alias("_missing_holes"),
+            pl.sum_horizontal(holes).alias("_hole_sum"),
+            pl.when(pl.any_horizontal(pl.col(par_holes).is_not_null()))
+            .then(pl.sum_horizontal(par_holes))
+            .alias("_par_total"),
+        )
+        .with_columns(pl.when(issues != "").then(issues).alias("Issues"))
+        .drop(*par_holes, "_missing_holes", "_hole_sum", "_par_total")
+        .collect()
+    )
+
+
+def split_rounds(checked: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
+    # -> (valid rounds, quarantined rounds with their Issues)
+    return (
+        checked.filter(pl.col("Issues").is_null()).drop("Issues"),
+        checked.filter(pl.col("Issues").is_not_null()),
+    )